@@ -1,57 +1,184 @@
+import io
 import os
+import re
 import logging
-import json
 import uuid
-from typing import Optional, Dict, List, Any, Tuple
+import time
+import hashlib
+import itertools
+from collections import OrderedDict, deque, namedtuple
+from typing import Optional, Dict, List, Any, Tuple, Sequence
 from contextlib import contextmanager
+from threading import Lock
+import orjson
 import psycopg2
-from psycopg2 import pool
-from psycopg2.extras import RealDictCursor
+from psycopg2 import pool, errors, sql, extensions
+from psycopg2.extras import RealDictCursor, Json, register_default_json, register_default_jsonb
 from dotenv import load_dotenv
 
 load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Pool sizing. ThreadedConnectionPool raises rather than waits when exhausted, so max defaults
+# to the worker threadpool size (THREADPOOL_SIZE in main.py): every sync handler can hold a
+# connection. It also closes any connection returned while minconn are already idle, so min
+# defaults to half of max to keep bursts from paying connection setup again.
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX") or os.getenv("THREADPOOL_SIZE") or 64)
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN") or max(4, DB_POOL_MAX // 2))
+
+# Server-side prepared statements kept per pooled connection (0 disables, e.g. behind pgbouncer)
+PREPARED_CACHE_SIZE = int(os.getenv("DB_PREPARED_CACHE_SIZE", 256))
+_PLACEHOLDER_RE = re.compile(r"%s")
+
+# In-process patient lookup cache (get_patient_by_id / get_patient_by_phone)
+PATIENT_CACHE_TTL_SECONDS = float(os.getenv("PATIENT_CACHE_TTL_SECONDS", 30))
+PATIENT_CACHE_MAX_SIZE = 1024
+
+
+def _json_dumps(obj: Any) -> str:
+    # orjson is C-level and much faster than json.dumps; default=str keeps Decimal/datetime values working
+    return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+# Any dict passed as a query parameter is sent as JSON (JSONB columns)
+extensions.register_adapter(dict, lambda d: Json(d, dumps=_json_dumps))
+# ...and json/jsonb results (message metadata, get_session_bundle's json_agg columns)
+# are decoded with orjson rather than the stdlib json psycopg2 registers by default
+register_default_json(loads=orjson.loads, globally=True)
+register_default_jsonb(loads=orjson.loads, globally=True)
+
+# Column names -> namedtuple row type for execute_query_raw
+_ROW_TYPES: Dict[Tuple[str, ...], type] = {}
+
+
+def _row_type(columns: Tuple[str, ...]) -> type:
+    row_type = _ROW_TYPES.get(columns)
+    if row_type is None:
+        row_type = _ROW_TYPES[columns] = namedtuple("Row", columns)
+    return row_type
+
+
+class _PooledConnection(extensions.connection):
+    """Connection that carries its own prepared-statement LRU, so the cache is freed with it."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Statement names PREPAREd on this connection, least recently used first
+        self.prepared: "OrderedDict[str, None]" = OrderedDict()
+
 
 class DatabaseConnection:
     _connection_pool: Optional[pool.ThreadedConnectionPool] = None
+    # Hot-standby pool for readonly=True reads; None when DB_HOST_RO is unset
+    _ro_pool: Optional[pool.ThreadedConnectionPool] = None
+    # Guards pool creation/teardown; get_connection only takes it before first init
+    _init_lock = Lock()
+    # SQL text -> statement name, shared by all connections
+    _statement_names: Dict[str, str] = {}
+    # Queries Postgres refused to PREPARE (e.g. uninferable parameter types)
+    _unpreparable: set = set()
+    # Recent getconn() wait times in seconds, for pool_stats()
+    _acquire_waits: deque = deque(maxlen=1024)
     
     @classmethod
-    def initialize_pool(cls, min_conn: int = 1, max_conn: int = 10):
-        if cls._connection_pool is not None:
-            logger.warning("Connection pool already initialized")
-            return
-        
-        try:
-            cls._connection_pool = pool.ThreadedConnectionPool(
-                min_conn, max_conn,
-                host=os.getenv('DB_HOST', 'localhost'),
-                port=os.getenv('DB_PORT', '5432'),
-                database=os.getenv('DB_NAME', 'pre_consultation_db'),
-                user=os.getenv('DB_USER', 'postgres'),
-                password=os.getenv('DB_PASSWORD', ''),
-                cursor_factory=RealDictCursor
+    def initialize_pool(cls, min_conn: Optional[int] = None, max_conn: Optional[int] = None):
+        with cls._init_lock:
+            if cls._connection_pool is not None:
+                logger.warning("Connection pool already initialized")
+                return
+            cls._create_pool(min_conn, max_conn)
+
+    @classmethod
+    def _create_pool(cls, min_conn: Optional[int], max_conn: Optional[int]):
+        # Caller holds _init_lock
+        max_conn = max_conn or DB_POOL_MAX
+        min_conn = min(min_conn or DB_POOL_MIN, max_conn)
+        threadpool_size = int(os.getenv("THREADPOOL_SIZE") or 64)
+        if max_conn < threadpool_size:
+            logger.warning(
+                f"DB pool max ({max_conn}) is below THREADPOOL_SIZE ({threadpool_size}); "
+                "bursts of concurrent requests can fail with PoolError"
             )
+        ro_host = os.getenv('DB_HOST_RO')
+        try:
+            cls._connection_pool = cls._build_pool(min_conn, max_conn, os.getenv('DB_HOST', 'localhost'))
             logger.info("Database connection pool initialized")
+            if ro_host:
+                cls._ro_pool = cls._build_pool(min_conn, max_conn, ro_host)
+                logger.info(f"Read-replica connection pool initialized ({ro_host})")
         except Exception as e:
             logger.error(f"Failed to initialize connection pool: {e}")
             raise
+
+    @staticmethod
+    def _build_pool(min_conn: int, max_conn: int, host: str) -> pool.ThreadedConnectionPool:
+        return pool.ThreadedConnectionPool(
+            min_conn, max_conn,
+            host=host,
+            port=os.getenv('DB_PORT', '5432'),
+            database=os.getenv('DB_NAME', 'pre_consultation_db'),
+            user=os.getenv('DB_USER', 'postgres'),
+            password=os.getenv('DB_PASSWORD', ''),
+            connection_factory=_PooledConnection,
+            cursor_factory=RealDictCursor,
+            # Detect dead peers instead of handing out silently broken idle connections
+            keepalives=1,
+            keepalives_idle=30,
+            tcp_user_timeout=15000,
+        )
     
     @classmethod
     def close_pool(cls):
-        if cls._connection_pool:
-            cls._connection_pool.closeall()
-            cls._connection_pool = None
-            logger.info("Database connection pool closed")
+        with cls._init_lock:
+            if cls._connection_pool:
+                cls._connection_pool.closeall()
+                cls._connection_pool = None
+                logger.info("Database connection pool closed")
+            if cls._ro_pool:
+                cls._ro_pool.closeall()
+                cls._ro_pool = None
+
+    @classmethod
+    def pool_stats(cls) -> Dict[str, Any]:
+        """Pool occupancy and recent acquire latency, for health/monitoring endpoints."""
+        p = cls._connection_pool
+        if p is None:
+            return {"initialized": False}
+        waits = sorted(cls._acquire_waits.copy())  # copy() is atomic; iterating a deque others append to is not
+        return {
+            "initialized": True,
+            "read_replica": cls._ro_pool is not None,
+            "min": p.minconn,
+            "max": p.maxconn,
+            "in_use": len(p._used),
+            "idle": len(p._pool),
+            "acquire_wait_ms_p95": round(waits[int(len(waits) * 0.95) - 1] * 1000, 2) if waits else 0.0,
+            "acquire_wait_ms_max": round(waits[-1] * 1000, 2) if waits else 0.0,
+        }
     
     @classmethod
     @contextmanager
-    def get_connection(cls):
-        if cls._connection_pool is None:
-            cls.initialize_pool()
+    def get_connection(cls, readonly: bool = False):
+        """
+        Borrow a pooled connection for one transaction. readonly=True routes to
+        the DB_HOST_RO replica when one is configured (reads there may lag the
+        primary slightly), otherwise to the primary.
+        """
+        # Fast path is a plain attribute read; the lock is only taken if startup
+        # didn't initialize the pool, so concurrent first requests build it once
+        conn_pool = cls._connection_pool
+        if conn_pool is None:
+            with cls._init_lock:
+                if cls._connection_pool is None:
+                    cls._create_pool(None, None)
+                conn_pool = cls._connection_pool
+        if readonly and cls._ro_pool is not None:
+            conn_pool = cls._ro_pool
         
-        conn = cls._connection_pool.getconn()
+        started = time.perf_counter()
+        conn = conn_pool.getconn()
+        cls._acquire_waits.append(time.perf_counter() - started)
         try:
             yield conn
             conn.commit()
@@ -60,24 +187,184 @@ class DatabaseConnection:
             logger.error(f"Database error: {e}")
             raise
         finally:
-            cls._connection_pool.putconn(conn)
+            conn_pool.putconn(conn)
     
     @classmethod
-    def execute_query(cls, query: str, params: Optional[Tuple] = None, fetch_one: bool = False):
-        with cls.get_connection() as conn:
+    def _prepare(cls, conn, query: str) -> Optional[str]:
+        """
+        Return the name of a prepared statement for query on this connection,
+        issuing PREPARE on first use. None when the query should run unprepared.
+        """
+        # Explicit %s::type casts (the unnest() bulk inserts) can't be honoured by
+        # EXECUTE, which binds arguments with assignment casts only
+        if (PREPARED_CACHE_SIZE <= 0 or query in cls._unpreparable
+                or "%%" in query or "%(" in query or "%s::" in query):
+            return None
+        name = cls._statement_names.get(query)
+        if name is None:
+            name = "stmt_" + hashlib.md5(query.encode()).hexdigest()
+            cls._statement_names[query] = name
+
+        prepared = conn.prepared
+        if name in prepared:
+            prepared.move_to_end(name)
+            return name
+
+        counter = itertools.count(1)
+        body = _PLACEHOLDER_RE.sub(lambda _: f"${next(counter)}", query)
+        with conn.cursor() as cur:
+            cur.execute(f"PREPARE {name} AS {body}")
+            prepared[name] = None
+            if len(prepared) > PREPARED_CACHE_SIZE:
+                evicted, _ = prepared.popitem(last=False)
+                cur.execute(f"DEALLOCATE {evicted}")
+        return name
+
+    @classmethod
+    def _execute(cls, conn, cur, query: str, params: Optional[Tuple]) -> None:
+        """
+        Run query through the connection's prepared statement cache.
+        Only used at the start of a get_connection() transaction, so rolling
+        back to recover from a failed PREPARE/EXECUTE loses nothing.
+        """
+        try:
+            name = cls._prepare(conn, query)
+        except (psycopg2.ProgrammingError, psycopg2.DataError) as e:
+            # Syntax/type problems with the PREPARE itself are permanent for this SQL;
+            # anything else (dropped connection etc.) propagates without poisoning the cache
+            conn.rollback()
+            cls._unpreparable.add(query)
+            logger.info(f"Running query unprepared: {e}")
+            name = None
+        if name is None:
+            cur.execute(query, params)
+            return
+
+        try:
+            if params:
+                cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+            else:
+                cur.execute(f"EXECUTE {name}")
+        except (errors.FeatureNotSupported, errors.InvalidSqlStatementName) as e:
+            # "cached plan must not change result type" after a schema change,
+            # or the server no longer has the statement — start this connection afresh
+            conn.rollback()
+            conn.prepared.clear()
+            cur.execute("DEALLOCATE ALL")
+            logger.warning(f"Prepared statement cache reset: {e}")
+            cur.execute(query, params)
+        except (errors.DatatypeMismatch, errors.CannotCoerce, errors.UndefinedFunction) as e:
+            # EXECUTE binds its arguments as literals, which only allows assignment
+            # casts; SQL relying on explicit %s::type casts must run unprepared
+            conn.rollback()
+            cur.execute(f"DEALLOCATE {name}")
+            conn.prepared.pop(name, None)
+            cls._unpreparable.add(query)
+            logger.info(f"Running query unprepared: {e}")
+            cur.execute(query, params)
+
+    @classmethod
+    def execute_query(cls, query: str, params: Optional[Tuple] = None, fetch_one: bool = False,
+                      readonly: bool = False):
+        with cls.get_connection(readonly) as conn:
             with conn.cursor() as cur:
-                cur.execute(query, params)
+                cls._execute(conn, cur, query, params)
                 return cur.fetchone() if fetch_one else cur.fetchall()
     
+    @classmethod
+    def execute_query_raw(cls, query: str, params: Optional[Tuple] = None,
+                          columns: Optional[Sequence[str]] = None, fetch_one: bool = False,
+                          readonly: bool = False):
+        """
+        Like execute_query but on a plain tuple cursor, skipping the per-row dict
+        RealDictCursor builds. With columns (matching the SELECT list order) rows
+        come back as namedtuples; without, as plain tuples.
+        """
+        with cls.get_connection(readonly) as conn:
+            with conn.cursor(cursor_factory=extensions.cursor) as cur:
+                cls._execute(conn, cur, query, params)
+                if fetch_one:
+                    row = cur.fetchone()
+                    return _row_type(tuple(columns))._make(row) if columns and row else row
+                rows = cur.fetchall()
+                if columns:
+                    make = _row_type(tuple(columns))._make
+                    return [make(r) for r in rows]
+                return rows
+    
     @classmethod
     def execute_update(cls, query: str, params: Optional[Tuple] = None) -> int:
         with cls.get_connection() as conn:
             with conn.cursor() as cur:
-                cur.execute(query, params)
+                cls._execute(conn, cur, query, params)
+                return cur.rowcount
+
+    @staticmethod
+    def _copy_field(value: Any) -> str:
+        if value is None:
+            return "\\N"
+        return (str(value).replace("\\", "\\\\").replace("\t", "\\t")
+                .replace("\n", "\\n").replace("\r", "\\r"))
+
+    @classmethod
+    def bulk_copy(cls, table: str, columns: List[str], rows: List[Tuple]) -> int:
+        """
+        Load rows with COPY FROM STDIN — one round trip regardless of row count.
+        Use for write-only bulk paths; COPY cannot return the inserted rows.
+        """
+        if not rows:
+            return 0
+        buf = io.StringIO()
+        for row in rows:
+            buf.write("\t".join(cls._copy_field(v) for v in row))
+            buf.write("\n")
+        buf.seek(0)
+        statement = sql.SQL("COPY {} ({}) FROM STDIN").format(
+            sql.Identifier(table), sql.SQL(", ").join(map(sql.Identifier, columns))
+        )
+        with cls.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.copy_expert(statement, buf)
                 return cur.rowcount
 
 
 class PatientDB:
+    # ("id", patient_id) / ("phone", phone_number) -> (row, monotonic expiry), oldest first.
+    # Loaders read the primary: a lagging replica row cached right after invalidate()
+    # would be served stale for the whole TTL.
+    _cache: "OrderedDict[Tuple[str, Any], Tuple[Dict, float]]" = OrderedDict()
+    _cache_lock = Lock()
+
+    @classmethod
+    def _cached(cls, key: Tuple[str, Any], loader) -> Optional[Dict]:
+        now = time.monotonic()
+        with cls._cache_lock:
+            entry = cls._cache.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    return dict(entry[0])
+                del cls._cache[key]
+        row = loader()
+        if row is not None and PATIENT_CACHE_TTL_SECONDS > 0:
+            with cls._cache_lock:
+                cls._cache[key] = (dict(row), now + PATIENT_CACHE_TTL_SECONDS)
+                cls._cache.move_to_end(key)
+                while len(cls._cache) > PATIENT_CACHE_MAX_SIZE:
+                    cls._cache.popitem(last=False)
+        return row
+
+    @classmethod
+    def invalidate(cls, patient_id: Optional[int] = None, phone_number: Optional[str] = None) -> None:
+        """Drop cached lookups for a patient (by id, and any phone entry pointing at it) and/or a phone number."""
+        with cls._cache_lock:
+            if phone_number is not None:
+                cls._cache.pop(("phone", phone_number), None)
+            if patient_id is not None:
+                cls._cache.pop(("id", patient_id), None)
+                for key in [k for k, (row, _) in cls._cache.items()
+                            if k[0] == "phone" and row.get("patient_id") == patient_id]:
+                    del cls._cache[key]
+
     @staticmethod
     def create_patient(full_name: str, phone_number: str, 
                       preferred_language: str = 'kinyarwanda', 
@@ -87,12 +374,11 @@ class PatientDB:
             VALUES (%s, %s, %s, %s)
             ON CONFLICT (phone_number, full_name) 
             DO UPDATE SET updated_at = CURRENT_TIMESTAMP
-            RETURNING *
+            RETURNING patient_id
         """
-        with DatabaseConnection.get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(query, (full_name, phone_number, preferred_language, location))
-                return dict(cur.fetchone())
+        patient = DatabaseConnection.execute_query(query, (full_name, phone_number, preferred_language, location), fetch_one=True)
+        PatientDB.invalidate(patient['patient_id'], phone_number)
+        return patient
     
     @staticmethod
     def create_new_patient(preferred_language: str = 'kinyarwanda', location: Optional[str] = None) -> Dict:
@@ -103,18 +389,20 @@ class PatientDB:
         - patient_phone_check: phone ~ '^[0-9+\-\(\) ]+$'
         - idx_patient_phone_name: unique (phone_number, full_name) — use unique placeholder
         """
-        unique_suffix = uuid.uuid4().hex[:12]
-        full_name = f"Pending-{unique_suffix}"
-        phone_number = "0"
+        full_name, phone_number = PatientDB.placeholder_identity()
         query = """
             INSERT INTO patient (full_name, phone_number, preferred_language, location)
             VALUES (%s, %s, %s, %s)
-            RETURNING *
+            RETURNING patient_id
         """
-        with DatabaseConnection.get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(query, (full_name, phone_number, preferred_language, location))
-                return dict(cur.fetchone())
+        patient = DatabaseConnection.execute_query(query, (full_name, phone_number, preferred_language, location), fetch_one=True)
+        PatientDB.invalidate(phone_number=phone_number)
+        return patient
+
+    @staticmethod
+    def placeholder_identity() -> Tuple[str, str]:
+        """(full_name, phone_number) for a kiosk placeholder patient; see create_new_patient."""
+        return f"Pending-{uuid.uuid4().hex[:12]}", "0"
 
     @staticmethod
     def update_patient(patient_id: int, full_name: str, phone_number: str, location: Optional[str] = None) -> Optional[Dict]:
@@ -122,37 +410,87 @@ class PatientDB:
             UPDATE patient
             SET full_name = %s, phone_number = %s, location = %s
             WHERE patient_id = %s
-            RETURNING *
+            RETURNING patient_id
         """
-        with DatabaseConnection.get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(query, (full_name, phone_number, location, patient_id))
-                return dict(cur.fetchone())
+        patient = DatabaseConnection.execute_query(query, (full_name, phone_number, location, patient_id), fetch_one=True)
+        PatientDB.invalidate(patient_id, phone_number)
+        return patient
 
     @staticmethod
     def get_patient_by_phone(phone_number: str) -> Optional[Dict]:
         query = "SELECT * FROM patient WHERE phone_number = %s ORDER BY created_at DESC LIMIT 1"
-        return DatabaseConnection.execute_query(query, (phone_number,), fetch_one=True)
+        return PatientDB._cached(
+            ("phone", phone_number),
+            lambda: DatabaseConnection.execute_query(query, (phone_number,), fetch_one=True),
+        )
     
     @staticmethod
     def get_patient_by_id(patient_id: int) -> Optional[Dict]:
         query = "SELECT * FROM patient WHERE patient_id = %s"
-        return DatabaseConnection.execute_query(query, (patient_id,), fetch_one=True)
+        return PatientDB._cached(
+            ("id", patient_id),
+            lambda: DatabaseConnection.execute_query(query, (patient_id,), fetch_one=True),
+        )
 
 
 class SessionDB:
     @staticmethod
     def create_session(patient_id: int) -> Dict:
-        query = "INSERT INTO session (patient_id, status) VALUES (%s, 'active') RETURNING *"
-        with DatabaseConnection.get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(query, (patient_id,))
-                return dict(cur.fetchone())
+        query = "INSERT INTO session (patient_id, status) VALUES (%s, 'active') RETURNING session_id"
+        return DatabaseConnection.execute_query(query, (patient_id,), fetch_one=True)
+    
+    @staticmethod
+    def start_consultation(preferred_language: str = 'kinyarwanda', location: Optional[str] = None) -> Dict:
+        """
+        Create the placeholder patient and its active session in one server call
+        (start_consultation() in schema.sql). Returns {"patient_id", "session_id"}.
+        """
+        full_name, phone_number = PatientDB.placeholder_identity()
+        query = "SELECT * FROM start_consultation(%s, %s, %s, %s)"
+        result = DatabaseConnection.execute_query(
+            query, (full_name, phone_number, preferred_language, location), fetch_one=True
+        )
+        PatientDB.invalidate(phone_number=phone_number)
+        return result
     
     @staticmethod
     def get_session(session_id: int) -> Optional[Dict]:
         query = "SELECT * FROM session WHERE session_id = %s"
-        return DatabaseConnection.execute_query(query, (session_id,), fetch_one=True)
+        return DatabaseConnection.execute_query(query, (session_id,), fetch_one=True, readonly=True)
+    
+    @staticmethod
+    def get_session_bundle(session_id: int) -> Optional[Dict]:
+        """
+        Session plus its patient, messages, symptoms, prediction and audio in one round trip.
+        Returns {"session", "patient", "messages", "symptoms", "prediction", "audio_recordings"}
+        or None if the session does not exist. Nested rows come back as JSON-decoded dicts.
+        """
+        query = """
+            SELECT s.*,
+                row_to_json(p) AS _patient,
+                COALESCE((SELECT json_agg(cm ORDER BY cm.sequence_number)
+                          FROM conversation_message cm WHERE cm.session_id = s.session_id), '[]'::json) AS _messages,
+                COALESCE((SELECT json_agg(sy ORDER BY sy.recorded_at)
+                          FROM symptom sy WHERE sy.session_id = s.session_id), '[]'::json) AS _symptoms,
+                (SELECT row_to_json(pr) FROM prediction pr WHERE pr.session_id = s.session_id) AS _prediction,
+                COALESCE((SELECT json_agg(ar ORDER BY ar.sequence_number)
+                          FROM audio_recording ar WHERE ar.session_id = s.session_id), '[]'::json) AS _audio
+            FROM session s
+            JOIN patient p ON p.patient_id = s.patient_id
+            WHERE s.session_id = %s
+        """
+        row = DatabaseConnection.execute_query(query, (session_id,), fetch_one=True, readonly=True)
+        if not row:
+            return None
+        session = dict(row)
+        return {
+            "patient":          session.pop("_patient"),
+            "messages":         session.pop("_messages"),
+            "symptoms":         session.pop("_symptoms"),
+            "prediction":       session.pop("_prediction"),
+            "audio_recordings": session.pop("_audio"),
+            "session":          session,
+        }
     
     @staticmethod
     def update_session_status(session_id: int, status: str) -> int:
@@ -162,10 +500,8 @@ class SessionDB:
     @staticmethod
     def close_session(session_id: int) -> int:
         query = "SELECT close_session(%s)"
-        with DatabaseConnection.get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(query, (session_id,))
-                return 1
+        DatabaseConnection.execute_query(query, (session_id,), fetch_one=True)
+        return 1
     
     @staticmethod
     def update_prediction_info(session_id: int, prediction_label: str, confidence: float) -> int:
@@ -174,53 +510,113 @@ class SessionDB:
     
     @staticmethod
     def get_sessions_awaiting_review() -> List[Dict]:
-        return DatabaseConnection.execute_query("SELECT * FROM v_sessions_awaiting_review")
+        return DatabaseConnection.execute_query("SELECT * FROM v_sessions_awaiting_review", readonly=True)
 
 
 class ConversationDB:
     @staticmethod
     def add_message(session_id: int, sender_type: str, message_text: str, 
-                    sequence_number: int, metadata: Optional[Dict] = None) -> Dict:
+                    sequence_number: Optional[int] = None, metadata: Optional[Dict] = None) -> Dict:
+        """
+        Insert one message. Without an explicit sequence_number the next one is
+        assigned inside the INSERT, so no get_last_sequence_number round trip is needed.
+        """
+        if sequence_number is not None:
+            return ConversationDB.add_messages(
+                [(session_id, sender_type, message_text, sequence_number, metadata)]
+            )[0]
         query = """
             INSERT INTO conversation_message 
             (session_id, sender_type, message_text, sequence_number, metadata)
-            VALUES (%s, %s, %s, %s, %s) RETURNING *
+            VALUES (%s, %s, %s,
+                    (SELECT COALESCE(MAX(sequence_number), 0) + 1
+                     FROM conversation_message WHERE session_id = %s),
+                    %s)
+            RETURNING message_id, sequence_number
         """
-        metadata_json = json.dumps(metadata) if metadata else None
-        with DatabaseConnection.get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(query, (session_id, sender_type, message_text, sequence_number, metadata_json))
-                return dict(cur.fetchone())
+        params = (session_id, sender_type, message_text, session_id,
+                  metadata or None)
+        try:
+            return DatabaseConnection.execute_query(query, params, fetch_one=True)
+        except errors.UniqueViolation:
+            # A concurrent writer took the same number (idx_message_session_sequence_unique);
+            # the retry sees its row and moves past it
+            return DatabaseConnection.execute_query(query, params, fetch_one=True)
+
+    @staticmethod
+    def add_messages(rows: List[Tuple]) -> List[Dict]:
+        """
+        Insert many messages in one statement and one transaction.
+        Each row is (session_id, sender_type, message_text, sequence_number, metadata).
+        """
+        if not rows:
+            return []
+        # One array parameter per column: the statement text (and its plan) is
+        # the same for any batch size, unlike a multi-row VALUES list
+        query = """
+            INSERT INTO conversation_message 
+            (session_id, sender_type, message_text, sequence_number, metadata)
+            SELECT * FROM unnest(%s::int[], %s::sender_type[], %s::text[], %s::int[], %s::jsonb[])
+            RETURNING message_id, sequence_number
+        """
+        session_ids, sender_types, texts, sequence_numbers, metadata = (list(col) for col in zip(*rows))
+        metadata = [m or None for m in metadata]
+        return DatabaseConnection.execute_query(
+            query, (session_ids, sender_types, texts, sequence_numbers, metadata)
+        )
     
+    _COLUMNS = ("message_id", "session_id", "sender_type", "message_text",
+                "timestamp", "sequence_number", "metadata")
+
     @staticmethod
-    def get_conversation(session_id: int) -> List[Dict]:
-        query = "SELECT * FROM conversation_message WHERE session_id = %s ORDER BY sequence_number"
-        return DatabaseConnection.execute_query(query, (session_id,))
+    def get_conversation(session_id: int) -> List[Tuple]:
+        """Messages in order, as namedtuples (use ._asdict() where a dict is needed)."""
+        query = f"""
+            SELECT {", ".join(ConversationDB._COLUMNS)} FROM conversation_message
+            WHERE session_id = %s ORDER BY sequence_number
+        """
+        return DatabaseConnection.execute_query_raw(query, (session_id,), columns=ConversationDB._COLUMNS, readonly=True)
     
     @staticmethod
     def get_last_sequence_number(session_id: int) -> int:
-        query = "SELECT COALESCE(MAX(sequence_number), 0) as last_seq FROM conversation_message WHERE session_id = %s"
-        result = DatabaseConnection.execute_query(query, (session_id,), fetch_one=True)
-        return result['last_seq'] if result else 0
+        query = "SELECT COALESCE(MAX(sequence_number), 0) FROM conversation_message WHERE session_id = %s"
+        return DatabaseConnection.execute_query_raw(query, (session_id,), fetch_one=True)[0]
 
 
 class SymptomDB:
     @staticmethod
     def add_symptom(session_id: int, symptom_name: str, severity: Optional[str] = None, 
                     duration: Optional[str] = None, additional_info: Optional[str] = None) -> Dict:
+        return SymptomDB.add_symptoms(
+            [(session_id, symptom_name, severity, duration, additional_info)]
+        )[0]
+
+    @staticmethod
+    def add_symptoms(rows: List[Tuple]) -> List[Dict]:
+        """
+        Insert many symptoms in one statement and one transaction.
+        Each row is (session_id, symptom_name, severity, duration, additional_info).
+        """
+        if not rows:
+            return []
         query = """
             INSERT INTO symptom (session_id, symptom_name, severity, duration, additional_info)
-            VALUES (%s, %s, %s, %s, %s) RETURNING *
+            SELECT * FROM unnest(%s::int[], %s::text[], %s::severity_level[], %s::text[], %s::text[])
+            RETURNING symptom_id
         """
-        with DatabaseConnection.get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(query, (session_id, symptom_name, severity, duration, additional_info))
-                return dict(cur.fetchone())
+        return DatabaseConnection.execute_query(query, tuple(list(col) for col in zip(*rows)))
     
+    _COLUMNS = ("symptom_id", "session_id", "symptom_name", "severity",
+                "duration", "additional_info", "recorded_at")
+
     @staticmethod
-    def get_session_symptoms(session_id: int) -> List[Dict]:
-        query = "SELECT * FROM symptom WHERE session_id = %s ORDER BY recorded_at"
-        return DatabaseConnection.execute_query(query, (session_id,))
+    def get_session_symptoms(session_id: int) -> List[Tuple]:
+        """Symptoms in recording order, as namedtuples (use ._asdict() where a dict is needed)."""
+        query = f"""
+            SELECT {", ".join(SymptomDB._COLUMNS)} FROM symptom
+            WHERE session_id = %s ORDER BY recorded_at
+        """
+        return DatabaseConnection.execute_query_raw(query, (session_id,), columns=SymptomDB._COLUMNS, readonly=True)
 
 
 class PredictionDB:
@@ -229,17 +625,27 @@ class PredictionDB:
                          confidence_score: float, model_version: Optional[str] = None) -> Dict:
         query = """
             INSERT INTO prediction (session_id, predicted_condition, risk_level, confidence_score, model_version)
-            VALUES (%s, %s, %s, %s, %s) RETURNING *
+            VALUES (%s, %s, %s, %s, %s) RETURNING prediction_id
         """
-        with DatabaseConnection.get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(query, (session_id, predicted_condition, risk_level, confidence_score, model_version))
-                return dict(cur.fetchone())
+        return DatabaseConnection.execute_query(query, (session_id, predicted_condition, risk_level, confidence_score, model_version), fetch_one=True)
+    
+    @staticmethod
+    def finalize_prediction(session_id: int, predicted_condition: str, risk_level: str,
+                            confidence_score: float, model_version: Optional[str] = None) -> Dict:
+        """
+        Insert the prediction and copy its label/confidence onto the session in one
+        server call (finalize_prediction() in schema.sql). Returns the prediction row.
+        """
+        query = "SELECT * FROM finalize_prediction(%s, %s, %s, %s, %s)"
+        return DatabaseConnection.execute_query(
+            query, (session_id, predicted_condition, risk_level, confidence_score, model_version),
+            fetch_one=True
+        )
     
     @staticmethod
     def get_session_prediction(session_id: int) -> Optional[Dict]:
         query = "SELECT * FROM prediction WHERE session_id = %s"
-        return DatabaseConnection.execute_query(query, (session_id,), fetch_one=True)
+        return DatabaseConnection.execute_query(query, (session_id,), fetch_one=True, readonly=True)
     
     @staticmethod
     def mark_reviewed(prediction_id: int, worker_id: int, review_notes: Optional[str] = None) -> int:
@@ -259,10 +665,7 @@ class PrescriptionDB:
             INSERT INTO prescription (session_id, worker_id, medication_name, dosage, instructions, duration, notes)
             VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING *
         """
-        with DatabaseConnection.get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(query, (session_id, worker_id, medication_name, dosage, instructions, duration, notes))
-                return dict(cur.fetchone())
+        return DatabaseConnection.execute_query(query, (session_id, worker_id, medication_name, dosage, instructions, duration, notes), fetch_one=True)
     
     @staticmethod
     def mark_dispensed(prescription_id: int) -> int:
@@ -279,17 +682,17 @@ class HealthcareWorkerDB:
     @staticmethod
     def get_worker(worker_id: int) -> Optional[Dict]:
         query = "SELECT * FROM healthcare_worker WHERE worker_id = %s"
-        return DatabaseConnection.execute_query(query, (worker_id,), fetch_one=True)
+        return DatabaseConnection.execute_query(query, (worker_id,), fetch_one=True, readonly=True)
     
     @staticmethod
     def get_worker_activity(worker_id: int) -> Optional[Dict]:
         query = "SELECT * FROM v_worker_activity WHERE worker_id = %s"
-        return DatabaseConnection.execute_query(query, (worker_id,), fetch_one=True)
+        return DatabaseConnection.execute_query(query, (worker_id,), fetch_one=True, readonly=True)
     
     @staticmethod
     def get_workers_by_facility(facility_id: int) -> List[Dict]:
         query = "SELECT * FROM healthcare_worker WHERE facility_id = %s AND is_active = TRUE"
-        return DatabaseConnection.execute_query(query, (facility_id,))
+        return DatabaseConnection.execute_query(query, (facility_id,), readonly=True)
     
     @staticmethod
     def create_worker(full_name: str, role: str, facility_id: int, user_id: Optional[int] = None,
@@ -298,10 +701,7 @@ class HealthcareWorkerDB:
             INSERT INTO healthcare_worker (full_name, role, facility_id, user_id, specialization, contact_info)
             VALUES (%s, %s, %s, %s, %s, %s) RETURNING *
         """
-        with DatabaseConnection.get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(query, (full_name, role, facility_id, user_id, specialization, contact_info))
-                return dict(cur.fetchone())
+        return DatabaseConnection.execute_query(query, (full_name, role, facility_id, user_id, specialization, contact_info), fetch_one=True)
     
     @staticmethod
     def update_worker(worker_id: int, **kwargs) -> int:
@@ -365,10 +765,7 @@ class UserDB:
             """
             params = (email, password_hash, full_name, role, facility_id)
 
-        with DatabaseConnection.get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(query, params)
-                return dict(cur.fetchone())
+        return DatabaseConnection.execute_query(query, params, fetch_one=True)
     
     @staticmethod
     def get_user_by_email(email: str) -> Optional[Dict]:
@@ -440,10 +837,7 @@ class FacilityDB:
             INSERT INTO facility (name, primary_email, primary_phone, location)
             VALUES (%s, %s, %s, %s) RETURNING *
         """
-        with DatabaseConnection.get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(query, (name, primary_email, primary_phone, location))
-                return dict(cur.fetchone())
+        return DatabaseConnection.execute_query(query, (name, primary_email, primary_phone, location), fetch_one=True)
     
     @staticmethod
     def get_facility(facility_id: int) -> Optional[Dict]:
@@ -511,10 +905,7 @@ class RoomDB:
             INSERT INTO room (facility_id, room_name, room_type, floor_number, capacity)
             VALUES (%s, %s, %s, %s, %s) RETURNING *
         """
-        with DatabaseConnection.get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(query, (facility_id, room_name, room_type, floor_number, capacity))
-                return dict(cur.fetchone())
+        return DatabaseConnection.execute_query(query, (facility_id, room_name, room_type, floor_number, capacity), fetch_one=True)
     
     @staticmethod
     def get_room(room_id: int) -> Optional[Dict]:
@@ -689,12 +1080,21 @@ class AudioDB:
                             duration_seconds: Optional[float] = None) -> Dict:
         query = """
             INSERT INTO audio_recording (session_id, sequence_number, speaker_type, file_path, file_size_bytes, duration_seconds)
-            VALUES (%s, %s, %s, %s, %s, %s) RETURNING *
+            VALUES (%s, %s, %s, %s, %s, %s) RETURNING audio_id
         """
-        with DatabaseConnection.get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(query, (session_id, sequence_number, speaker_type, file_path, file_size_bytes, duration_seconds))
-                return dict(cur.fetchone())
+        return DatabaseConnection.execute_query(query, (session_id, sequence_number, speaker_type, file_path, file_size_bytes, duration_seconds), fetch_one=True)
+
+    @staticmethod
+    def save_audio_references(rows: List[Tuple]) -> int:
+        """
+        Bulk-save audio references via COPY.
+        Each row is (session_id, sequence_number, speaker_type, file_path, file_size_bytes).
+        """
+        return DatabaseConnection.bulk_copy(
+            "audio_recording",
+            ["session_id", "sequence_number", "speaker_type", "file_path", "file_size_bytes"],
+            rows,
+        )
     
     @staticmethod
     def get_session_audio(session_id: int) -> List[Dict]:
@@ -733,10 +1133,10 @@ class ExtendedSessionDB:
             WHERE session_id = %s
         """
         return DatabaseConnection.execute_update(query, (
-            json.dumps(extraction_data),
-            json.dumps(score_data),
+            Json(extraction_data, dumps=_json_dumps),
+            Json(score_data, dumps=_json_dumps),
             patient_message,
-            json.dumps(doctor_brief),
+            Json(doctor_brief, dumps=_json_dumps),
             full_transcript,
             transcript_confidence,
             detected_language,
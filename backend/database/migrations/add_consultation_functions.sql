@@ -0,0 +1,60 @@
+-- ============================================================================
+-- MIGRATION: Add start_consultation and finalize_prediction functions
+-- Date: October 15, 2026
+-- Purpose: Do the kiosk's multi-statement writes in one server call each
+--          (patient + session at start, prediction + session labels at finish)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION start_consultation(
+    p_full_name VARCHAR,
+    p_phone_number VARCHAR,
+    p_preferred_language language_preference,
+    p_location VARCHAR
+)
+RETURNS TABLE (patient_id INTEGER, session_id INTEGER) AS $$
+#variable_conflict use_column
+DECLARE
+    v_patient_id INTEGER;
+    v_session_id INTEGER;
+BEGIN
+    INSERT INTO patient (full_name, phone_number, preferred_language, location)
+    VALUES (p_full_name, p_phone_number, p_preferred_language, p_location)
+    RETURNING patient.patient_id INTO v_patient_id;
+
+    INSERT INTO session (patient_id, status)
+    VALUES (v_patient_id, 'active')
+    RETURNING session.session_id INTO v_session_id;
+
+    RETURN QUERY SELECT v_patient_id, v_session_id;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION finalize_prediction(
+    p_session_id INTEGER,
+    p_predicted_condition VARCHAR,
+    p_risk_level risk_level,
+    p_confidence_score NUMERIC,
+    p_model_version VARCHAR
+)
+RETURNS prediction AS $$
+DECLARE
+    v_prediction prediction;
+BEGIN
+    INSERT INTO prediction (session_id, predicted_condition, risk_level, confidence_score, model_version)
+    VALUES (p_session_id, p_predicted_condition, p_risk_level, p_confidence_score, p_model_version)
+    RETURNING * INTO v_prediction;
+
+    UPDATE session
+    SET prediction_label = p_predicted_condition,
+        prediction_confidence = p_confidence_score
+    WHERE session_id = p_session_id;
+
+    RETURN v_prediction;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================================
+-- ROLLBACK:
+--   DROP FUNCTION IF EXISTS start_consultation(VARCHAR, VARCHAR, language_preference, VARCHAR);
+--   DROP FUNCTION IF EXISTS finalize_prediction(INTEGER, VARCHAR, risk_level, NUMERIC, VARCHAR);
+-- ============================================================================
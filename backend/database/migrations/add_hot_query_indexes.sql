@@ -0,0 +1,47 @@
+-- ============================================================================
+-- MIGRATION: Composite indexes for hot lookups, drop redundant ones
+-- Date: October 15, 2026
+-- Purpose: Match the WHERE/ORDER BY of the hottest reads so they come back
+--          pre-sorted from the index:
+--            get_patient_by_phone  WHERE phone_number = ? ORDER BY created_at DESC LIMIT 1
+--            get_session_symptoms  WHERE session_id = ? ORDER BY recorded_at
+--          conversation_message(session_id, sequence_number) and prediction(session_id)
+--          are already covered by their UNIQUE indexes; the plain duplicates only
+--          cost extra writes and are dropped.
+-- NOTE: CONCURRENTLY cannot run inside a transaction block — run with plain
+--       `psql -f` (no -1 / --single-transaction).
+-- ============================================================================
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_patient_phone_created
+    ON patient(phone_number, created_at DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_symptom_session_recorded
+    ON symptom(session_id, recorded_at);
+
+-- Superseded by the composites above (same leading column)
+DROP INDEX CONCURRENTLY IF EXISTS idx_patient_phone;
+DROP INDEX CONCURRENTLY IF EXISTS idx_symptom_session;
+
+-- Duplicates of idx_message_session_sequence_unique / idx_prediction_session_unique
+DROP INDEX CONCURRENTLY IF EXISTS idx_message_session;
+DROP INDEX CONCURRENTLY IF EXISTS idx_message_session_sequence;
+DROP INDEX CONCURRENTLY IF EXISTS idx_prediction_session;
+
+-- Verify (expect Index Scan / Index Only Scan, no Sort node):
+--   EXPLAIN (ANALYZE, BUFFERS)
+--     SELECT * FROM patient WHERE phone_number = '0788000000' ORDER BY created_at DESC LIMIT 1;
+--   EXPLAIN (ANALYZE, BUFFERS)
+--     SELECT * FROM symptom WHERE session_id = 1 ORDER BY recorded_at;
+--   EXPLAIN (ANALYZE, BUFFERS)
+--     SELECT * FROM conversation_message WHERE session_id = 1 ORDER BY sequence_number;
+
+-- ============================================================================
+-- ROLLBACK:
+--   CREATE INDEX idx_patient_phone ON patient(phone_number);
+--   CREATE INDEX idx_symptom_session ON symptom(session_id);
+--   CREATE INDEX idx_message_session ON conversation_message(session_id);
+--   CREATE INDEX idx_message_session_sequence ON conversation_message(session_id, sequence_number);
+--   CREATE INDEX idx_prediction_session ON prediction(session_id);
+--   DROP INDEX IF EXISTS idx_patient_phone_created;
+--   DROP INDEX IF EXISTS idx_symptom_session_recorded;
+-- ============================================================================
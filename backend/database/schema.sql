@@ -19,7 +19,7 @@ CREATE TABLE patient (
     CONSTRAINT patient_name_length CHECK (LENGTH(TRIM(full_name)) >= 2)
 );
 
-CREATE INDEX idx_patient_phone ON patient(phone_number);
+CREATE INDEX idx_patient_phone_created ON patient(phone_number, created_at DESC);
 CREATE INDEX idx_patient_name ON patient(full_name);
 CREATE INDEX idx_patient_created_at ON patient(created_at DESC);
 CREATE UNIQUE INDEX idx_patient_phone_name ON patient(phone_number, full_name);
@@ -78,9 +78,7 @@ CREATE TABLE conversation_message (
     CONSTRAINT message_sequence_positive CHECK (sequence_number > 0)
 );
 
-CREATE INDEX idx_message_session ON conversation_message(session_id);
 CREATE INDEX idx_message_timestamp ON conversation_message(timestamp);
-CREATE INDEX idx_message_session_sequence ON conversation_message(session_id, sequence_number);
 CREATE UNIQUE INDEX idx_message_session_sequence_unique ON conversation_message(session_id, sequence_number);
 
 CREATE TABLE symptom (
@@ -96,7 +94,7 @@ CREATE TABLE symptom (
     CONSTRAINT symptom_name_not_empty CHECK (LENGTH(TRIM(symptom_name)) > 0)
 );
 
-CREATE INDEX idx_symptom_session ON symptom(session_id);
+CREATE INDEX idx_symptom_session_recorded ON symptom(session_id, recorded_at);
 CREATE INDEX idx_symptom_name ON symptom(symptom_name);
 CREATE INDEX idx_symptom_severity ON symptom(severity);
 
@@ -119,7 +117,6 @@ CREATE TABLE prediction (
     CONSTRAINT prediction_review_time_check CHECK (reviewed_at IS NULL OR reviewed_at >= generated_at)
 );
 
-CREATE INDEX idx_prediction_session ON prediction(session_id);
 CREATE INDEX idx_prediction_condition ON prediction(predicted_condition);
 CREATE INDEX idx_prediction_risk ON prediction(risk_level);
 CREATE INDEX idx_prediction_reviewer ON prediction(reviewed_by);
@@ -243,6 +240,54 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+CREATE OR REPLACE FUNCTION start_consultation(
+    p_full_name VARCHAR,
+    p_phone_number VARCHAR,
+    p_preferred_language language_preference,
+    p_location VARCHAR
+)
+RETURNS TABLE (patient_id INTEGER, session_id INTEGER) AS $$
+#variable_conflict use_column
+DECLARE
+    v_patient_id INTEGER;
+    v_session_id INTEGER;
+BEGIN
+    INSERT INTO patient (full_name, phone_number, preferred_language, location)
+    VALUES (p_full_name, p_phone_number, p_preferred_language, p_location)
+    RETURNING patient.patient_id INTO v_patient_id;
+
+    INSERT INTO session (patient_id, status)
+    VALUES (v_patient_id, 'active')
+    RETURNING session.session_id INTO v_session_id;
+
+    RETURN QUERY SELECT v_patient_id, v_session_id;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION finalize_prediction(
+    p_session_id INTEGER,
+    p_predicted_condition VARCHAR,
+    p_risk_level risk_level,
+    p_confidence_score NUMERIC,
+    p_model_version VARCHAR
+)
+RETURNS prediction AS $$
+DECLARE
+    v_prediction prediction;
+BEGIN
+    INSERT INTO prediction (session_id, predicted_condition, risk_level, confidence_score, model_version)
+    VALUES (p_session_id, p_predicted_condition, p_risk_level, p_confidence_score, p_model_version)
+    RETURNING * INTO v_prediction;
+
+    UPDATE session
+    SET prediction_label = p_predicted_condition,
+        prediction_confidence = p_confidence_score
+    WHERE session_id = p_session_id;
+
+    RETURN v_prediction;
+END;
+$$ LANGUAGE plpgsql;
+
 -- ============================================================================
 -- EXTENDED SCHEMA: Authentication, Facilities, Rooms, Queue Management
 -- ============================================================================
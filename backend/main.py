@@ -12,9 +12,13 @@ load_dotenv()
 
 import asyncio
 import os
+import anyio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+from prometheus_fastapi_instrumentator import Instrumentator
 
 from models import model_a
 from routers import sessions, transcription, dialogue, triage, kiosk, doctor
@@ -22,6 +26,9 @@ from routers import auth, facilities, rooms, queue, patients, doctors
 from database.database import DatabaseConnection
 
 
+# Worker threads for sync endpoints (DB and session-store handlers); AnyIO defaults to 40
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", 64))
+
 # Global state to track initialization
 _startup_info = {
     "database_ready": False,
@@ -34,6 +41,8 @@ _startup_info = {
 async def lifespan(app: FastAPI):
     global _startup_info
     _startup_info = {"database_ready": False, "models_ready": False, "startup_errors": []}
+
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
     
     # Initialize database connection pool (skip if USE_DB=false)
     if os.getenv('USE_DB', 'true').lower() != 'false':
@@ -93,6 +102,7 @@ app = FastAPI(
     description="Voice-based triage pipeline for Kinyarwanda and English patients.",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware for Flutter web app
@@ -103,6 +113,11 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Session, transcript and brief payloads are repetitive JSON; compress them for slow clinic links
+app.add_middleware(GZipMiddleware, minimum_size=512)
+
+# Prometheus: per-route request metrics plus the model stage timers in utils/metrics.py
+Instrumentator().instrument(app).expose(app, include_in_schema=False)
 
 # Authentication
 app.include_router(auth.router)
@@ -126,18 +141,19 @@ app.include_router(doctors.router)
 
 
 @app.get("/health")
-def health():
+async def health():
     """Basic health check. Always returns 200 even if systems are degraded."""
     return {
         "status": "ok",
         "database_ready": _startup_info["database_ready"],
         "models_ready": _startup_info["models_ready"],
         "startup_errors": _startup_info["startup_errors"],
+        "database_pool": DatabaseConnection.pool_stats(),
     }
 
 
 @app.get("/startup/status")
-def startup_status():
+async def startup_status():
     """
     Detailed startup status. Use this to wait for server readiness.
     
@@ -159,6 +175,6 @@ def startup_status():
 
 
 @app.get("/models/status")
-def models_status():
+async def models_status():
     """Check if AI models are loaded and ready."""
     return model_a.get_models_status()
@@ -14,6 +14,7 @@ Language handling:
 
 import io
 import os
+import re
 import numpy as np
 import librosa
 import soundfile as sf
@@ -26,6 +27,14 @@ DEVICE   = os.getenv("DEVICE", "cpu")
 DTYPE    = torch.float16 if DEVICE == "cuda" else torch.float32
 HF_TOKEN = os.getenv("HF_TOKEN")
 
+# Max 30s segments sent through the Whisper pipeline per forward pass
+BATCH_SIZE = int(os.getenv("WHISPER_BATCH_SIZE", 4))
+
+# Optional cap on intra-op threads per forward pass on CPU. Unset keeps torch's
+# default (all cores), which suits the usual one-recording-at-a-time kiosk; set it
+# when several transcriptions run concurrently and would oversubscribe the cores.
+TORCH_NUM_THREADS = int(os.getenv("TORCH_NUM_THREADS") or 0)
+
 # Audio format validation
 MAX_AUDIO_SIZE_MB = 50  # Maximum file size in MB
 MAX_DURATION_SECONDS = 300  # 5 minutes max
@@ -35,6 +44,7 @@ _WHISPER_TO_LANG = {
     "en": "english",
 }
 _LANG_TO_WHISPER = {v: k for k, v in _WHISPER_TO_LANG.items()}
+_SUPPORTED_LANGUAGES = frozenset(_LANG_TO_WHISPER)
 _DEFAULT_LANGUAGE = "kinyarwanda"
 
 _kin_pipe       = None
@@ -49,6 +59,8 @@ def load_models():
 
     try:
         print(f"   DEVICE: {DEVICE} (torch.cuda.is_available={torch.cuda.is_available()})")
+        if DEVICE == "cpu" and TORCH_NUM_THREADS > 0:
+            torch.set_num_threads(TORCH_NUM_THREADS)
         _loading_status = "loading_kinyarwanda_model"
         _kin_pipe = pipeline(
             "automatic-speech-recognition",
@@ -74,6 +86,16 @@ def load_models():
         _kin_pipe.model.generation_config = GenerationConfig.from_pretrained("openai/whisper-large-v3")
         print("Generation config updated.")
 
+        # One pass on a second of silence so lazy kernel/allocator init
+        # happens here rather than on the first patient's request
+        _loading_status = "warming_up"
+        silence = np.zeros(SR, dtype=np.float32)
+        for pipe in (_kin_pipe, _eng_pipe):
+            try:
+                pipe(silence, generate_kwargs={"task": "transcribe"})
+            except Exception as e:
+                print(f"Whisper warm-up failed (continuing): {e}")
+
         _loading_status = "ready"
         _models_ready   = True
         print("Whisper models loaded.")
@@ -127,7 +149,7 @@ def _detect_language(audio: np.ndarray, language_hint: Optional[str] = None) ->
         # Whisper detected something else (e.g. French, Swahili)
         # Use the hint if available, otherwise fall back to default
         print(f"  Unrecognized language '{detected}', using hint/default")
-        if language_hint in ("kinyarwanda", "english"):
+        if language_hint in _SUPPORTED_LANGUAGES:
             return language_hint
         return _DEFAULT_LANGUAGE
 
@@ -137,14 +159,18 @@ def _detect_language(audio: np.ndarray, language_hint: Optional[str] = None) ->
     except Exception as e:
         print(f"  ⚠️ Language detection failed: {type(e).__name__}: {e}")
         print(f"  Falling back to hint={language_hint} or default={_DEFAULT_LANGUAGE}")
-        return language_hint if language_hint in ("kinyarwanda", "english") else _DEFAULT_LANGUAGE
+        return language_hint if language_hint in _SUPPORTED_LANGUAGES else _DEFAULT_LANGUAGE
+
+
+# Whisper placeholder tokens that mark a chunk as non-speech
+_NON_SPEECH_RE = re.compile(r"\[(?:BLANK_AUDIO|MUSIC)\]")
 
 
 def _confidence(chunks: list) -> float:
     if not chunks:
         return 0.0
-    bad  = ["[BLANK_AUDIO]", "[MUSIC]"]
-    hits = sum(1 for c in chunks if any(t in c.get("text", "") for t in bad))
+    search = _NON_SPEECH_RE.search
+    hits   = sum(1 for c in chunks if search(c.get("text", "")))
     return round(max(0.0, 1.0 - hits / len(chunks)), 3)
 
 
@@ -202,10 +228,15 @@ def transcribe(audio_bytes: bytes, language_hint: Optional[str] = None) -> dict:
     if len(audio_bytes) < 100:
         raise RuntimeError("Audio file too small or corrupted. Minimum size: 100 bytes.")
 
-    # Load audio with librosa (WAV format only for simplicity and reliability)
+    # Decode WAV straight to float32 (WAV format only for simplicity and reliability).
+    # Kiosk recordings are already 16kHz mono, so librosa is only needed to resample.
     print(f"Loading audio file ({size_mb:.2f}MB)...")
     try:
-        audio, actual_sr = librosa.load(io.BytesIO(audio_bytes), sr=SR, mono=True)
+        audio, file_sr = sf.read(io.BytesIO(audio_bytes), dtype="float32", always_2d=False)
+        if audio.ndim > 1:
+            audio = audio.mean(axis=1)
+        if file_sr != SR:
+            audio = librosa.resample(audio, orig_sr=file_sr, target_sr=SR)
     except Exception as e:
         error_msg = str(e).lower()
         if "input" in error_msg or "format" in error_msg or "decode" in error_msg:
@@ -232,7 +263,7 @@ def transcribe(audio_bytes: bytes, language_hint: Optional[str] = None) -> dict:
 
     # Detect language (skip full detection when user selected a supported language - saves ~30-60s on CPU)
     skip_detection = os.getenv("SKIP_LANG_DETECTION_WHEN_HINTED", "false").lower() == "true"
-    if skip_detection and language_hint in ("kinyarwanda", "english"):
+    if skip_detection and language_hint in _SUPPORTED_LANGUAGES:
         print(f"Using language hint (fast mode): {language_hint}")
         resolved = language_hint
     else:
@@ -254,71 +285,67 @@ def transcribe(audio_bytes: bytes, language_hint: Optional[str] = None) -> dict:
     # English model supports multiple languages - pass language parameter
     is_kinyarwanda = (resolved == "kinyarwanda")
 
-    # Process audio in 30-second segments
+    # Process audio in 30-second segments, batched through the pipeline in one call
     seg_len  = 30 * SR
-    num_segments = (len(audio) + seg_len - 1) // seg_len
-    print(f"Processing {num_segments} segment(s) with {resolved} model...")
-    
-    segments = []
+    chunk_arrays = [
+        # Ensure float32 dtype and C-contiguous for compatibility
+        np.ascontiguousarray(audio[i : i + seg_len], dtype=np.float32)
+        for i in range(0, len(audio), seg_len)
+    ]
+    num_segments = len(chunk_arrays)
+    batch_size   = max(1, min(BATCH_SIZE, num_segments))
+    print(f"Processing {num_segments} segment(s) with {resolved} model (batch size {batch_size})...")
+
+    # Build generate_kwargs based on model type
+    if is_kinyarwanda:
+        # Kinyarwanda model is specialized - no language parameter needed
+        generate_kwargs = {"task": "transcribe"}
+    else:
+        # English model supports multiple languages
+        generate_kwargs = {"task": "transcribe", "language": lang_token}
 
-    for i in range(0, len(audio), seg_len):
-        seg_num = (i // seg_len) + 1
-        print(f"  Segment {seg_num}/{num_segments}...", end=" ", flush=True)
-        
-        chunk  = audio[i : i + seg_len]
-        
+    try:
+        # Try with timestamps first for confidence calculation
         try:
-            # Pass audio array directly - transformers pipeline handles sampling rate internally
-            # Ensure float32 dtype and C-contiguous for compatibility
-            chunk_array = np.ascontiguousarray(chunk, dtype=np.float32)
-            
-            # Build generate_kwargs based on model type
-            if is_kinyarwanda:
-                # Kinyarwanda model is specialized - no language parameter needed
-                generate_kwargs = {"task": "transcribe"}
-            else:
-                # English model supports multiple languages
-                generate_kwargs = {"task": "transcribe", "language": lang_token}
-            
-            # Try with timestamps first for confidence calculation
-            try:
-                result = pipe(
-                    chunk_array,
+            results = pipe(
+                chunk_arrays,
+                batch_size=batch_size,
+                generate_kwargs=generate_kwargs,
+                return_timestamps=True,
+            )
+            segments = [
+                {
+                    "text":       r.get("text", "").strip(),
+                    "confidence": _confidence(r.get("chunks", [])),
+                }
+                for r in results
+            ]
+        except (KeyError, TypeError, AttributeError, ValueError) as ts_error:
+            # If timestamps fail (num_frames error, etc), retry without timestamps
+            error_str = str(ts_error).lower()
+            if any(x in error_str for x in ["num_frames", "numpy ndarray", "chunks", "timestamps"]):
+                print("  ⚠️ Retrying without timestamps...", flush=True)
+                results = pipe(
+                    chunk_arrays,
+                    batch_size=batch_size,
                     generate_kwargs=generate_kwargs,
-                    return_timestamps=True,
+                    return_timestamps=False,
                 )
-                chunks = result.get("chunks", [])
-                text = result.get("text", "").strip()
-                conf = _confidence(chunks)
-            except (KeyError, TypeError, AttributeError, ValueError) as ts_error:
-                # If timestamps fail (num_frames error, etc), retry without timestamps
-                error_str = str(ts_error).lower()
-                if any(x in error_str for x in ["num_frames", "numpy ndarray", "chunks", "timestamps"]):
-                    print(f"⚠️ Retrying without timestamps... ", end="", flush=True)
-                    result = pipe(
-                        chunk_array,
-                        generate_kwargs=generate_kwargs,
-                        return_timestamps=False,
-                    )
-                    text = result.get("text", "").strip()
-                    conf = 1.0  # Assume good confidence if no chunks available
-                else:
-                    raise
-            
-            segments.append({
-                "text":       text,
-                "confidence": conf,
-            })
-            print(f"✓ (conf: {conf:.2f})")
-            
-        except KeyboardInterrupt:
-            print("✗ Interrupted")
-            raise
-        except Exception as e:
-            print(f"✗ Error: {type(e).__name__}: {e}")
-            import traceback
-            traceback.print_exc()
-            raise RuntimeError(f"Transcription failed at segment {seg_num}/{num_segments}: {type(e).__name__}: {e}")
+                # Assume good confidence if no chunks available
+                segments = [{"text": r.get("text", "").strip(), "confidence": 1.0} for r in results]
+            else:
+                raise
+    except KeyboardInterrupt:
+        print("✗ Interrupted")
+        raise
+    except Exception as e:
+        print(f"✗ Error: {type(e).__name__}: {e}")
+        import traceback
+        traceback.print_exc()
+        raise RuntimeError(f"Transcription failed ({num_segments} segment(s)): {type(e).__name__}: {e}")
+
+    for seg_num, seg in enumerate(segments, 1):
+        print(f"  Segment {seg_num}/{num_segments} ✓ (conf: {seg['confidence']:.2f})")
 
     full_text = " ".join(s["text"] for s in segments if s["text"])
     mean_conf = round(float(np.mean([s["confidence"] for s in segments])), 3)
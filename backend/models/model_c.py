@@ -24,6 +24,13 @@ RED_FLAG_FOLLOWUPS = [
     "Is the patient able to move all limbs normally?",
 ]
 
+# Fields that must be filled before the questioning loop can stop early
+_COVERAGE_KEY_FIELDS = ("chief_complaint", "severity", "duration", "associated_symptoms")
+
+# Prompt blocks built from the constant lists above, once at import
+_RED_FLAG_BLOCK = "\nRED FLAG ACTIVE. Prioritise these:\n" + "\n".join(f"- {q}" for q in RED_FLAG_FOLLOWUPS) + "\n"
+_COVERAGE_BLOCK = "\n".join(f"- {c}" for c in COVERAGE_CHECKLIST)
+
 _SYSTEM = """You are a clinical question-selection assistant in a hospital pre-consultation system.
 Output ONE question only. Nothing else.
 Rules:
@@ -58,7 +65,6 @@ def select_next_question(extraction: dict, questions_asked: list[str],
     from .model_c_rules import PATIENT_INFO_QUESTIONS
     lang = extraction.get("language", "kinyarwanda")
     info_questions = PATIENT_INFO_QUESTIONS.get(lang, PATIENT_INFO_QUESTIONS["kinyarwanda"])
-    info_fields = [q["targets"] for q in info_questions]
     for q in info_questions:
         # Skip if already filled OR already asked (don't repeat even if extraction lost the value)
         if not extraction.get(q["targets"]) and q["question"] not in questions_asked:
@@ -66,22 +72,17 @@ def select_next_question(extraction: dict, questions_asked: list[str],
 
     # After patient info, proceed as before
     system_prompt = _SYSTEM
-    known = [f"{k}: {v}" for k, v in extraction.items() if v]
+    known_lines = "\n".join(f"- {k}: {v}" for k, v in extraction.items() if v) or "- (unknown)"
 
     history_lines = "\n".join(
         f"  Q: {q}\n  A: {a}"
         for q, a in zip(questions_asked, patient_answers)
     ) or "  (none)"
 
-    red_flag_block = ""
-    if extraction.get("red_flags_present"):
-        followups      = "\n".join(f"- {q}" for q in RED_FLAG_FOLLOWUPS)
-        red_flag_block = f"\nRED FLAG ACTIVE. Prioritise these:\n{followups}\n"
-
-    coverage = "\n".join(f"- {c}" for c in COVERAGE_CHECKLIST)
+    red_flag_block = _RED_FLAG_BLOCK if extraction.get("red_flags_present") else ""
 
     prompt = f"""Patient state:
-{chr(10).join(f'- {k}' for k in known) or '- (unknown)'}
+{known_lines}
 
 Conversation so far:
 {history_lines}
@@ -89,7 +90,7 @@ Conversation so far:
 Stage: {_stage(len(questions_asked))}
 {red_flag_block}
 Coverage checklist (must be addressed eventually):
-{coverage}
+{_COVERAGE_BLOCK}
 
 Output the single best next question."""
 
@@ -126,6 +127,5 @@ def is_coverage_complete(extraction: dict, num_turns: int, max_turns: int) -> bo
     Return True when the session has collected enough information to proceed.
     Coverage is complete when all key fields are filled OR max_turns is reached.
     """
-    key_fields = ["chief_complaint", "severity", "duration", "associated_symptoms"]
-    all_filled  = all(extraction.get(f) for f in key_fields)
+    all_filled = all(extraction.get(f) for f in _COVERAGE_KEY_FIELDS)
     return all_filled or num_turns >= max_turns
@@ -15,8 +15,8 @@ Expansion: Add more symptoms based on usage data.
 
 import json
 import os
+import time
 from typing import List, Dict, Optional
-from datetime import datetime
 
 # ============================================================================
 # PATIENT INFO QUESTIONS (Always ask FIRST)
@@ -390,6 +390,23 @@ COMPLAINT_MAPPINGS = {
     ]
 }
 
+
+def _scan_complaint(complaint_lower: str) -> str:
+    """Substring scan over COMPLAINT_MAPPINGS; first matching canonical wins."""
+    for canonical, variations in COMPLAINT_MAPPINGS.items():
+        if any(var in complaint_lower for var in variations):
+            return canonical
+    return "unknown"
+
+
+# Exact variation / canonical name → canonical, resolved with the same scan so
+# the fast path always agrees with it
+_COMPLAINT_LOOKUP = {
+    key: _scan_complaint(key)
+    for canonical, variations in COMPLAINT_MAPPINGS.items()
+    for key in (canonical, *variations)
+}
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -411,11 +428,12 @@ def normalize_complaint(complaint: str) -> str:
     """
     complaint_lower = complaint.lower().strip()
     
-    for canonical, variations in COMPLAINT_MAPPINGS.items():
-        if any(var in complaint_lower for var in variations):
-            return canonical
+    # Most complaints arrive as a known variation or canonical name — one dict hit
+    canonical = _COMPLAINT_LOOKUP.get(complaint_lower)
+    if canonical is not None:
+        return canonical
     
-    return "unknown"
+    return _scan_complaint(complaint_lower)
 
 
 def get_patient_info_questions(language: str = "kinyarwanda") -> List[Dict]:
@@ -526,7 +544,7 @@ def log_unknown_symptom(complaint: str):
     """
     _UNKNOWN_SYMPTOMS_LOG.append({
         "complaint": complaint,
-        "timestamp": datetime.now().isoformat()
+        "ts": time.time()  # epoch seconds; format when reporting
     })
     
     # In production, this would write to database
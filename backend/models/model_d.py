@@ -26,6 +26,10 @@ ISSUE_CATEGORIES = [
     "unclear or unclassifiable complaint",
 ]
 
+# Safety override inputs — red flag plus one of these severities skips the API call
+_SEVERE_LEVELS   = frozenset({"severe", "extreme", "unbearable", "very severe"})
+_CARDIO_KEYWORDS = ("chest", "breath", "heart")
+
 _TRIAGE_RULES = """
 HIGH: red flag present, OR severity severe/extreme/8-10, OR acute rapid onset, OR infant/elderly with moderate+ symptoms.
 MEDIUM: moderate severity (4-7/10), symptom hours to days, mild associated symptoms, no red flags.
@@ -34,6 +38,11 @@ Confidence: 0.8-1.0 if severity + duration + red flag status all known. 0.5-0.79
 Risk factors: observable facts only. Max 4. Short phrases.
 """
 
+# Constant prompt sections, rendered once at import
+_CATEGORIES_BLOCK = "\n".join(f"- {c}" for c in ISSUE_CATEGORIES)
+_SCHEMA_JSON      = json.dumps({"priority": "HIGH|MEDIUM|LOW", "suspected_issue": "<one from list>",
+                                "risk_factors": ["<fact>"], "confidence": 0.0}, indent=2)
+
 _SYSTEM = """You are a clinical triage scoring assistant. Output a risk score for clinician review only.
 Rules:
 - No diagnosis, no treatment advice, no patient-facing language.
@@ -88,9 +97,9 @@ def score(extraction: dict, age: Optional[int] = None) -> dict:
     red_flag = extraction.get("red_flags_present")
 
     # Safety override — skip API call for confirmed severe red flags
-    if red_flag and severity in ("severe", "extreme", "unbearable", "very severe"):
+    if red_flag and severity in _SEVERE_LEVELS:
         issue = ("cardiorespiratory-related complaint"
-                 if any(w in symptom.lower() for w in ["chest", "breath", "heart"])
+                 if any(w in symptom.lower() for w in _CARDIO_KEYWORDS)
                  else "general or systemic complaint")
         return {
             "priority":        "HIGH",
@@ -108,17 +117,13 @@ def score(extraction: dict, age: Optional[int] = None) -> dict:
         "red_flags_present":   red_flag,
         "age":                 age,
     }
-    schema     = {"priority": "HIGH|MEDIUM|LOW", "suspected_issue": "<one from list>",
-                  "risk_factors": ["<fact>"], "confidence": 0.0}
-    categories = "\n".join(f"- {c}" for c in ISSUE_CATEGORIES)
-
     prompt = f"""Patient data:\n{json.dumps(data, indent=2)}
 
-Allowed categories:\n{categories}
+Allowed categories:\n{_CATEGORIES_BLOCK}
 
 Triage rules:\n{_TRIAGE_RULES}
 
-Schema:\n{json.dumps(schema, indent=2)}
+Schema:\n{_SCHEMA_JSON}
 
 Return the populated JSON only."""
 
@@ -24,6 +24,8 @@ _FALLBACK = {
     },
 }
 
+_PRIORITIES = frozenset({"HIGH", "MEDIUM", "LOW"})
+
 _FORBIDDEN = [
     "you have", "you may have", "this is", "this could be", "diagnosis",
     "heart attack", "stroke", "cancer", "infection",
@@ -70,7 +72,7 @@ def generate_message(extraction: dict, score: dict, language: str = "english",
     priority  = score.get("priority", "UNKNOWN").upper()
     templates = _FALLBACK.get(language, _FALLBACK["english"])
 
-    if low_confidence or priority not in ("HIGH", "MEDIUM", "LOW"):
+    if low_confidence or priority not in _PRIORITIES:
         return templates["UNKNOWN"]
 
     rf = score.get("red_flags_present") or extraction.get("red_flags_present")
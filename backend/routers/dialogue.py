@@ -26,7 +26,7 @@ import asyncio
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
 from pydantic import BaseModel
 
-from session import get_session, SessionStage, ConversationTurn
+from session import get_session, aget_session, save_session, asave_session, SessionStage, ConversationTurn
 from models import model_a, model_b, model_c
 from models.model_c_rules import get_symptom_questions, get_patient_info_questions
 
@@ -85,6 +85,7 @@ def get_next_question(session_id: str):
                 session.extraction = session.light_extraction  # Fallback
             
             session.stage = SessionStage.SCORING
+            save_session(session)
             return {
                 "session_id":        session.id,
                 "stage":             session.stage.value,
@@ -120,6 +121,7 @@ def get_next_question(session_id: str):
                 session.extraction = session.light_extraction  # Fallback
             
             session.stage = SessionStage.SCORING
+            save_session(session)
             return {
                 "session_id":        session.id,
                 "stage":             session.stage.value,
@@ -154,6 +156,7 @@ def get_next_question(session_id: str):
                 session.extraction = session.light_extraction  # Fallback
             
             session.stage = SessionStage.SCORING
+            save_session(session)
             return {
                 "session_id":        session.id,
                 "stage":             session.stage.value,
@@ -171,6 +174,7 @@ def get_next_question(session_id: str):
     
     session.stage = SessionStage.QUESTIONING
     session.cost_estimate = session.api_calls_count * 0.0004
+    save_session(session)
 
     return {
         "session_id":        session.id,
@@ -191,7 +195,7 @@ async def submit_answer(session_id: str, body: AnswerRequest):
 
     Transitions session: QUESTIONING → QUESTIONING (loop) or → SCORING (when done)
     """
-    session = get_session(session_id)
+    session = await aget_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found.")
     if session.stage != SessionStage.QUESTIONING:
@@ -221,6 +225,7 @@ async def submit_answer(session_id: str, body: AnswerRequest):
     
     if is_complete:
         session.stage = SessionStage.SCORING
+        await asave_session(session)
         return {
             "session_id":        session.id,
             "stage":             session.stage.value,
@@ -234,6 +239,7 @@ async def submit_answer(session_id: str, body: AnswerRequest):
         questions_asked = session.questions_asked,
         patient_answers = session.patient_answers,
     )
+    await asave_session(session)
 
     return {
         "session_id":        session.id,
@@ -259,7 +265,7 @@ async def submit_answer_audio(
 
     Transitions session: QUESTIONING → QUESTIONING (loop) or → SCORING (when done)
     """
-    session = get_session(session_id)
+    session = await aget_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found.")
     if session.stage != SessionStage.QUESTIONING:
@@ -300,6 +306,7 @@ async def submit_answer_audio(
     
     if is_complete:
         session.stage = SessionStage.SCORING
+        await asave_session(session)
         return {
             "session_id":         session.id,
             "stage":              session.stage.value,
@@ -325,6 +332,7 @@ async def submit_answer_audio(
         session.api_calls_count += 1
 
     session.cost_estimate = session.api_calls_count * 0.0004
+    await asave_session(session)
     return {
         "session_id":         session.id,
         "stage":              session.stage.value,
@@ -11,14 +11,17 @@ POST /doctor/queue/reset        → reset queue counters (start of day)
 """
 
 from fastapi import APIRouter, HTTPException
-from session import get_session, all_session_ids, SessionStage
+from session import get_session, all_sessions, SessionStage
 from routing import get_queue_lengths, reset_queues
 
 router = APIRouter(prefix="/doctor", tags=["doctor"])
 
+# Dashboard sort order — HIGH first, unscored last
+_PRIORITY_ORDER = {"HIGH": 0, "MEDIUM": 1, "LOW": 2, "": 3}
+
 
 @router.get("/queue")
-def get_queue():
+async def get_queue():
     """
     Return current queue lengths across all departments.
     Used by the dashboard to display waiting numbers.
@@ -27,7 +30,7 @@ def get_queue():
 
 
 @router.post("/queue/reset")
-def reset_queue():
+async def reset_queue():
     """Reset all queue counters. Call at the start of each day."""
     reset_queues()
     return {"message": "All queues reset."}
@@ -40,10 +43,7 @@ def list_sessions():
     Useful for the doctor dashboard overview panel.
     """
     sessions = []
-    for sid in all_session_ids():
-        s = get_session(sid)
-        if not s:
-            continue
+    for s in all_sessions():
         sessions.append({
             "session_id":      s.id,
             "stage":           s.stage.value,
@@ -54,8 +54,7 @@ def list_sessions():
         })
 
     # Sort so HIGH priority and COMPLETE sessions appear first
-    priority_order = {"HIGH": 0, "MEDIUM": 1, "LOW": 2, "": 3}
-    sessions.sort(key=lambda x: priority_order.get(x["priority"], 3))
+    sessions.sort(key=lambda x: _PRIORITY_ORDER.get(x["priority"], 3))
     return {"sessions": sessions, "total": len(sessions)}
 
 
@@ -18,23 +18,24 @@ only WAV format is supported. See backend/AUDIO_FORMAT.md for details.
     Frontend apps should record audio in WAV format (16kHz mono recommended).
     
 Data persistence:
-    Sessions live in memory during conversation for speed.
+    Sessions live in the session store (memory, or Redis when REDIS_URL is set)
+    during conversation for speed.
     Audio files and all data are persisted to database only when session completes.
 """
 
 import os
 import re
-import asyncio
 import uuid
 from pathlib import Path
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Body
 from pydantic import BaseModel
 from typing import Optional
 
-from session import get_session, create_session, SessionStage, ConversationTurn
+from session import get_session, aget_session, create_session, save_session, asave_session, SessionStage, ConversationTurn
 from routing import assign_routing, suggest_unclear_issue_routing
 from models import model_a, model_b, model_c, model_d, model_e, model_f
 from models.model_c_rules import PATIENT_INFO_QUESTIONS
+from utils.metrics import MODEL_STAGE_SECONDS, timed_to_thread
 from database.database import (
     PatientDB, SessionDB, ConversationDB, SymptomDB, PredictionDB,
     AudioDB, QueueDB, ExtendedSessionDB, DatabaseConnection, FacilityDB
@@ -102,21 +103,26 @@ class StatusResponse(BaseModel):
 # Helpers
 # ---------------------------------------------------------------------------
 
+_SUPPORTED_LANGUAGES = frozenset({"kinyarwanda", "english"})
+
+_GREETINGS = {
+    "kinyarwanda": (
+        "Murakaza neza. Ndi sisitemu ifasha muganga wawe gutegura ikiganiro cyanyu. "
+        "Ndabaza ibibazo bike kugirango amakuru yanyu ategurwe mbere yuko muganga abakira. "
+        "Twatangira?"
+    ),
+    "english": (
+        "Welcome. I am a pre-consultation assistant, not a doctor. "
+        "I will ask you a few questions so your doctor can review your case before meeting you. "
+        "Ready to begin?"
+    ),
+}
+# No selection — offer both
+_GREETING_BILINGUAL = "Welcome / Murakaza neza. Please speak to begin. / Vuga kugirango utangire."
+
+
 def _greeting(language: Optional[str]) -> str:
-    if language == "kinyarwanda":
-        return (
-            "Murakaza neza. Ndi sisitemu ifasha muganga wawe gutegura ikiganiro cyanyu. "
-            "Ndabaza ibibazo bike kugirango amakuru yanyu ategurwe mbere yuko muganga abakira. "
-            "Twatangira?"
-        )
-    if language == "english":
-        return (
-            "Welcome. I am a pre-consultation assistant, not a doctor. "
-            "I will ask you a few questions so your doctor can review your case before meeting you. "
-            "Ready to begin?"
-        )
-    # No selection — offer both
-    return "Welcome / Murakaza neza. Please speak to begin. / Vuga kugirango utangire."
+    return _GREETINGS.get(language, _GREETING_BILINGUAL)
 
 
 def _save_audio_file(session_id: str, audio_bytes: bytes, sequence: int, speaker: str) -> str:
@@ -174,12 +180,15 @@ _KINYARWANDA_NUMBERS = {
     "icumi": 10, "cumi": 10, "ijana": 100,
 }
 
+# Longest first so longer phrases match before shorter prefixes — sorted once at import
+_NAME_INTRO_PHRASES_LONGEST_FIRST = tuple(sorted(_NAME_INTRO_PHRASES, key=len, reverse=True))
+_KINYARWANDA_NUMBERS_LONGEST_FIRST = tuple(sorted(_KINYARWANDA_NUMBERS, key=len, reverse=True))
+
 
 def _clean_name(raw: str) -> str:
     """Strip Kinyarwanda/English intro phrases from name answers."""
     lower = raw.strip().lower()
-    # Sort by length descending so longer phrases match before shorter prefixes
-    for phrase in sorted(_NAME_INTRO_PHRASES, key=len, reverse=True):
+    for phrase in _NAME_INTRO_PHRASES_LONGEST_FIRST:
         if lower.startswith(phrase):
             result = raw.strip()[len(phrase):].strip().strip(".,;")
             if result:
@@ -207,7 +216,7 @@ def _words_to_age(text: str) -> Optional[int]:
             return val
 
     # 3. Kinyarwanda: try longest phrase match first, then check "na <ones>"
-    for phrase in sorted(_KINYARWANDA_NUMBERS, key=len, reverse=True):
+    for phrase in _KINYARWANDA_NUMBERS_LONGEST_FIRST:
         if phrase in lower:
             base = _KINYARWANDA_NUMBERS[phrase]
             rest_match = re.search(re.escape(phrase) + r'\s+na\s+(\w+)', lower)
@@ -234,29 +243,34 @@ def _words_to_age(text: str) -> Optional[int]:
     return None
 
 
-def _normalize_extraction_patient_info(extraction: dict) -> dict:
+def _normalize_extraction_patient_info(extraction: dict) -> Optional[int]:
     """
     Post-process model_b extraction to ensure name/age/location are consistently
     formatted regardless of whether the LLM applied normalization or not.
+
+    Returns the parsed patient age (or None) so callers don't parse it twice.
     """
     if extraction.get("patient_name"):
         extraction["patient_name"] = _clean_name(extraction["patient_name"])
 
+    age_int = None
     if extraction.get("patient_age"):
         age_int = _words_to_age(str(extraction["patient_age"]))
         if age_int is not None:
             extraction["patient_age"] = str(age_int)
 
-    return extraction
+    return age_int
+
+
+# Normalized question text → extraction field, built once from the static question set
+_PATIENT_INFO_TARGETS: dict[str, str] = {}
+for _language_questions in PATIENT_INFO_QUESTIONS.values():
+    for _q in _language_questions:
+        _PATIENT_INFO_TARGETS.setdefault(_normalize_text(_q.get("question", "")).lower(), _q.get("targets"))
 
 
 def _resolve_patient_info_target(question: str) -> Optional[str]:
-    normalized_question = _normalize_text(question).lower()
-    for language_questions in PATIENT_INFO_QUESTIONS.values():
-        for q in language_questions:
-            if _normalize_text(q.get("question", "")).lower() == normalized_question:
-                return q.get("targets")
-    return None
+    return _PATIENT_INFO_TARGETS.get(_normalize_text(question).lower())
 
 
 def _capture_patient_info_from_answer(session, question: str, answer: str) -> None:
@@ -339,15 +353,12 @@ def kiosk_start(body: StartRequest):
         resolved_facility_id = FacilityDB.resolve_facility_id(body.facility_id)
         print(f"Facility ID: {body.facility_id} -> using {resolved_facility_id}")
 
-        # Create or get patient in database
-        patient = PatientDB.create_new_patient(
+        # Create placeholder patient and its session in database (one round trip)
+        db_session = SessionDB.start_consultation(
             preferred_language=normalized_language if normalized_language != "unknown" else "kinyarwanda",
             location=body.patient_location
         )
-        print(f"Patient DB ID: {patient['patient_id']}")
-        
-        # Create session in database
-        db_session = SessionDB.create_session(patient['patient_id'])
+        print(f"Patient DB ID: {db_session['patient_id']}")
         print(f"Session DB ID: {db_session['session_id']}")
         
     except Exception as e:
@@ -372,9 +383,10 @@ def kiosk_start(body: StartRequest):
     )
     # Store DB IDs in memory session for later
     session.db_session_id = db_session['session_id']
-    session.db_patient_id = patient['patient_id']
+    session.db_patient_id = db_session['patient_id']
     session.facility_id = resolved_facility_id
     session.patient_location = (body.patient_location or "").strip()
+    save_session(session)
     
     greeting = _greeting(normalized_language)
     
@@ -407,7 +419,7 @@ async def kiosk_audio(
     print("🎤 INITIAL AUDIO RECEIVED")
     print(f"Session ID: {session_id}")
     
-    session = get_session(session_id)
+    session = await aget_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found.")
     if session.stage != SessionStage.AWAITING_AUDIO:
@@ -428,7 +440,7 @@ async def kiosk_audio(
 
     print("\n🔄 Running Model A (Speech-to-Text)...")
     try:
-        a_result = await asyncio.to_thread(model_a.transcribe, audio_bytes, language_hint=hint)
+        a_result = await timed_to_thread("transcription", model_a.transcribe, audio_bytes, language_hint=hint)
         print(f"✅ Transcription successful!")
         print(f"📝 PATIENT SAID: '{a_result['full_text']}'")
         print(f"   Confidence: {a_result['mean_confidence']:.2%}")
@@ -448,8 +460,8 @@ async def kiosk_audio(
 
     print("\n🔄 Running Model B (Clinical Extraction)...")
     try:
-        session.extraction = await asyncio.to_thread(model_b.extract, session.transcript)
-        _normalize_extraction_patient_info(session.extraction)
+        session.extraction = await timed_to_thread("extraction", model_b.extract, session.transcript)
+        age_int = _normalize_extraction_patient_info(session.extraction)
         print(f"✅ Extraction successful!")
         print(f"   Extracted: {session.extraction}")
 
@@ -457,10 +469,8 @@ async def kiosk_audio(
             session.patient_name = session.extraction["patient_name"]
             print(f"   📝 Patient name extracted: {session.patient_name}")
         if session.extraction.get("patient_age"):
-            age_int = _words_to_age(str(session.extraction["patient_age"]))
             if age_int is not None:
                 session.patient_age = age_int
-                session.extraction["patient_age"] = str(age_int)
             print(f"   📝 Patient age extracted: {session.patient_age}")
         if session.extraction.get("patient_gender"):
             session.patient_gender = session.extraction["patient_gender"]
@@ -478,12 +488,14 @@ async def kiosk_audio(
         raise HTTPException(status_code=500, detail=f"Extraction error: {type(e).__name__}: {e}")
 
     print("\n🔄 Running Model C (Question Generation)...")
-    question = model_c.select_next_question(
-        extraction      = session.extraction,
-        questions_asked = session.questions_asked,
-        patient_answers = session.patient_answers,
-    )
+    with MODEL_STAGE_SECONDS.labels("question").time():
+        question = model_c.select_next_question(
+            extraction      = session.extraction,
+            questions_asked = session.questions_asked,
+            patient_answers = session.patient_answers,
+        )
     session.stage = SessionStage.QUESTIONING
+    await asave_session(session)
     print(f"✅ Question generated!")
     print(f"💬 ASSISTANT ASKS: '{question}'")
     print("="*80 + "\n")
@@ -516,7 +528,7 @@ async def kiosk_answer(
     print(f"Session ID: {session_id}")
     print(f"Previous question: '{question}'")
     
-    session = get_session(session_id)
+    session = await aget_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found.")
     if session.stage != SessionStage.QUESTIONING:
@@ -536,7 +548,7 @@ async def kiosk_answer(
     # For answers, use the already-detected session language as the hint
     print(f"\n🔄 Running Model A (Transcribing answer in {session.language})...")
     try:
-        a_result = await asyncio.to_thread(model_a.transcribe, audio_bytes, language_hint=session.language)
+        a_result = await timed_to_thread("transcription", model_a.transcribe, audio_bytes, language_hint=session.language)
         answer   = a_result["full_text"]
         print(f"✅ Transcription successful!")
         print(f"📝 PATIENT ANSWERED: '{answer}'")
@@ -555,24 +567,23 @@ async def kiosk_answer(
             {"question": t.question, "answer": t.answer}
             for t in session.turns
         ]
-        target_language = session.language if session.language in {"kinyarwanda", "english"} else "kinyarwanda"
-        session.extraction = await asyncio.to_thread(
+        target_language = session.language if session.language in _SUPPORTED_LANGUAGES else "kinyarwanda"
+        session.extraction = await timed_to_thread(
+            "extraction",
             model_b.extract_full,
             session.transcript,
             conversation_history=conversation_history,
             target_language=target_language,
         )
-        _normalize_extraction_patient_info(session.extraction)
+        age_int = _normalize_extraction_patient_info(session.extraction)
         print(f"✅ Extraction updated: {session.extraction}")
 
         if session.extraction.get("patient_name"):
             session.patient_name = session.extraction["patient_name"]
             print(f"   📝 Patient name extracted: {session.patient_name}")
         if session.extraction.get("patient_age"):
-            age_int = _words_to_age(str(session.extraction["patient_age"]))
             if age_int is not None:
                 session.patient_age = age_int
-                session.extraction["patient_age"] = str(age_int)
             print(f"   📝 Patient age extracted: {session.patient_age}")
         if session.extraction.get("patient_gender"):
             session.patient_gender = session.extraction["patient_gender"]
@@ -601,6 +612,7 @@ async def kiosk_answer(
     print("\n🔄 Running Model C (Checking coverage)...")
     if model_c.is_coverage_complete(session.extraction, len(session.turns), MAX_TURNS):
         session.stage = SessionStage.SCORING
+        await asave_session(session)
         print(f"✅ Coverage complete! ({len(session.turns)} turns completed)")
         print("="*80 + "\n")
         return QuestionResponse(
@@ -612,11 +624,13 @@ async def kiosk_answer(
         )
 
     print(f"📊 Coverage not yet complete ({len(session.turns)}/{MAX_TURNS} turns)")
-    next_q = model_c.select_next_question(
-        extraction      = session.extraction,
-        questions_asked = session.questions_asked,
-        patient_answers = session.patient_answers,
-    )
+    with MODEL_STAGE_SECONDS.labels("question").time():
+        next_q = model_c.select_next_question(
+            extraction      = session.extraction,
+            questions_asked = session.questions_asked,
+            patient_answers = session.patient_answers,
+        )
+    await asave_session(session)
     print(f"✅ Next question generated!")
     print(f"💬 ASSISTANT ASKS: '{next_q}'")
     print("="*80 + "\n")
@@ -650,7 +664,7 @@ async def kiosk_finish(
     print("🏁 FINISHING SESSION")
     print(f"Session ID: {session_id}")
     
-    session = get_session(session_id)
+    session = await aget_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found.")
     if session.stage != SessionStage.SCORING:
@@ -659,14 +673,15 @@ async def kiosk_finish(
     full_transcript = _build_full_transcript(session)
 
     print("\n🔄 Running Model D (Risk Scoring)...")
-    session.score = await asyncio.to_thread(model_d.score, session.extraction, age=session.patient_age)
+    session.score = await timed_to_thread("scoring", model_d.score, session.extraction, age=session.patient_age)
     print(f"✅ Score: {session.score}")
 
     routing_override_department = None
     suspected_issue = str(session.score.get("suspected_issue", "")).strip().lower()
     if session.score.get("priority") != "HIGH" and suspected_issue == "unclear or unclassifiable complaint":
         print("\n🔄 Running unclear-issue routing fallback...")
-        fallback = await asyncio.to_thread(
+        fallback = await timed_to_thread(
+            "routing_fallback",
             suggest_unclear_issue_routing,
             extraction=session.extraction,
             questions_asked=session.questions_asked,
@@ -690,7 +705,8 @@ async def kiosk_finish(
     print(f"✅ Routing: {routing.department}, Queue: {routing.queue}")
 
     print("\n🔄 Running Model E (Patient Message)...")
-    session.patient_message = await asyncio.to_thread(
+    session.patient_message = await timed_to_thread(
+        "patient_message",
         model_e.generate_message,
         extraction     = session.extraction,
         score          = session.score,
@@ -701,7 +717,8 @@ async def kiosk_finish(
     print(f"✅ Patient message generated")
 
     print("\n🔄 Running Model F (Doctor Brief)...")
-    session.doctor_brief = await asyncio.to_thread(
+    session.doctor_brief = await timed_to_thread(
+        "doctor_brief",
         model_f.generate_brief,
         session_id      = session.id,
         extraction      = session.extraction,
@@ -748,62 +765,41 @@ async def kiosk_finish(
 
         # 1. Save audio file references
         if hasattr(session, 'audio_files'):
-            for seq, speaker, path, size in session.audio_files:
-                AudioDB.save_audio_reference(
-                    session_id=session.db_session_id,
-                    sequence_number=seq,
-                    speaker_type=speaker,
-                    file_path=path,
-                    file_size_bytes=size
-                )
+            AudioDB.save_audio_references([
+                (session.db_session_id, seq, speaker, path, size)
+                for seq, speaker, path, size in session.audio_files
+            ])
             print(f"✅ Saved {len(session.audio_files)} audio references")
 
-        # 2. Save conversation messages
-        seq_num = 1
-        ConversationDB.add_message(
-            session_id=session.db_session_id,
-            sender_type='patient',
-            message_text=session.transcript,
-            sequence_number=seq_num
-        )
-        seq_num += 1
+        # 2. Save conversation messages in one batch
+        messages = [(session.db_session_id, 'patient', session.transcript, 1, None)]
         for turn in session.turns:
-            ConversationDB.add_message(
-                session_id=session.db_session_id,
-                sender_type='ml_system',
-                message_text=turn.question,
-                sequence_number=seq_num
-            )
-            seq_num += 1
-            ConversationDB.add_message(
-                session_id=session.db_session_id,
-                sender_type='patient',
-                message_text=turn.answer,
-                sequence_number=seq_num
-            )
-            seq_num += 1
-        print(f"✅ Saved {seq_num - 1} conversation messages")
-
-        # 3. Save symptoms (each symptom in its own try so one bad entry can't abort the rest)
-        symptoms_list = session.extraction.get('associated_symptoms') or []
+            seq_num = len(messages) + 1
+            messages.append((session.db_session_id, 'ml_system', turn.question, seq_num, None))
+            messages.append((session.db_session_id, 'patient', turn.answer, seq_num + 1, None))
+        ConversationDB.add_messages(messages)
+        print(f"✅ Saved {len(messages)} conversation messages")
+
+        # 3. Save symptoms in one batch; if it fails, retry row by row so one
+        #    bad entry can't abort the rest
+        symptom_rows = []
+        for symptom in session.extraction.get('associated_symptoms') or []:
+            if isinstance(symptom, dict):
+                symptom_rows.append((session.db_session_id, symptom.get('name', 'unknown'), None,
+                                     symptom.get('duration'), symptom.get('description')))
+            else:
+                symptom_rows.append((session.db_session_id, str(symptom), None, None, None))
         saved_symptoms = 0
-        for symptom in symptoms_list:
-            try:
-                if isinstance(symptom, dict):
-                    SymptomDB.add_symptom(
-                        session_id=session.db_session_id,
-                        symptom_name=symptom.get('name', 'unknown'),
-                        duration=symptom.get('duration'),
-                        additional_info=symptom.get('description')
-                    )
-                else:
-                    SymptomDB.add_symptom(
-                        session_id=session.db_session_id,
-                        symptom_name=str(symptom)
-                    )
-                saved_symptoms += 1
-            except Exception as sym_err:
-                print(f"⚠️ Could not save symptom '{symptom}': {sym_err}")
+        try:
+            saved_symptoms = len(SymptomDB.add_symptoms(symptom_rows))
+        except Exception as batch_err:
+            print(f"⚠️ Batch symptom insert failed, retrying individually: {batch_err}")
+            for row in symptom_rows:
+                try:
+                    SymptomDB.add_symptoms([row])
+                    saved_symptoms += 1
+                except Exception as sym_err:
+                    print(f"⚠️ Could not save symptom '{row[1]}': {sym_err}")
         if saved_symptoms:
             print(f"✅ Saved {saved_symptoms} symptoms")
 
@@ -811,7 +807,7 @@ async def kiosk_finish(
         db_risk_level = str(session.score.get('priority', 'medium')).strip().lower()
         if db_risk_level not in {'low', 'medium', 'high'}:
             db_risk_level = 'medium'
-        PredictionDB.create_prediction(
+        PredictionDB.finalize_prediction(
             session_id=session.db_session_id,
             predicted_condition=session.score.get('suspected_issue', 'Unknown'),
             risk_level=db_risk_level,
@@ -893,6 +889,7 @@ async def kiosk_finish(
         import traceback
         traceback.print_exc()
     
+    await asave_session(session)
     print("="*80 + "\n")
 
     return FinishResponse(
@@ -13,8 +13,7 @@ from fastapi import APIRouter, HTTPException, Depends, Query
 from pydantic import BaseModel
 
 from database.database import (
-    PatientDB, SessionDB, ExtendedSessionDB, ConversationDB,
-    SymptomDB, PredictionDB, AudioDB, DatabaseConnection
+    PatientDB, SessionDB, ExtendedSessionDB, DatabaseConnection
 )
 from routers.auth import get_current_user, require_role
 
@@ -146,20 +145,15 @@ def get_session_details(
     - Prediction
     - Audio recordings (file paths)
     """
-    # Get session
-    session = SessionDB.get_session(session_id)
-    if not session:
+    # Session and all related data in a single query
+    bundle = SessionDB.get_session_bundle(session_id)
+    if not bundle:
         raise HTTPException(status_code=404, detail="Session not found")
+    session = bundle["session"]
     
     if session['patient_id'] != patient_id:
         raise HTTPException(status_code=400, detail="Session does not belong to this patient")
     
-    # Get related data
-    conversation = ConversationDB.get_conversation(session_id)
-    symptoms = SymptomDB.get_session_symptoms(session_id)
-    prediction = PredictionDB.get_session_prediction(session_id)
-    audio_recordings = AudioDB.get_session_audio(session_id)
-    
     return SessionDetail(
         session_id=session['session_id'],
         patient_id=session['patient_id'],
@@ -173,8 +167,8 @@ def get_session_details(
         score_data=session.get('score_data'),
         patient_message=session.get('patient_message'),
         doctor_brief=session.get('doctor_brief'),
-        conversation=[dict(c) for c in conversation],
-        symptoms=[dict(s) for s in symptoms],
-        prediction=dict(prediction) if prediction else None,
-        audio_recordings=[dict(a) for a in audio_recordings]
+        conversation=bundle["messages"],
+        symptoms=bundle["symptoms"],
+        prediction=bundle["prediction"],
+        audio_recordings=bundle["audio_recordings"]
     )
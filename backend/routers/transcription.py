@@ -15,7 +15,7 @@ import asyncio
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
 from typing import Optional
 
-from session import get_session, SessionStage
+from session import aget_session, asave_session, SessionStage
 from models import model_a, model_b
 from routing.conversation_router import route_conversation
 
@@ -49,7 +49,7 @@ async def receive_audio(
                    f"Check /startup/status and retry in a few seconds."
         )
     
-    session = get_session(session_id)
+    session = await aget_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found.")
     if session.stage != SessionStage.AWAITING_AUDIO:
@@ -125,6 +125,7 @@ async def receive_audio(
 
     # Estimate cost based on API calls so far
     session.cost_estimate = session.api_calls_count * 0.0004  # Rough estimate
+    await asave_session(session)
     
     return {
         "session_id":             session.id,
@@ -11,7 +11,7 @@ POST /sessions/{id}/complete
 import asyncio
 from fastapi import APIRouter, HTTPException
 
-from session import get_session, SessionStage
+from session import aget_session, asave_session, SessionStage
 from models import model_d, model_e, model_f
 
 router = APIRouter(prefix="/sessions", tags=["triage"])
@@ -26,7 +26,7 @@ async def complete_session(session_id: str):
 
     Transitions session: SCORING → COMPLETE
     """
-    session = get_session(session_id)
+    session = await aget_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found.")
     if session.stage != SessionStage.SCORING:
@@ -63,6 +63,7 @@ async def complete_session(session_id: str):
     )
 
     session.stage = SessionStage.COMPLETE
+    await asave_session(session)
 
     return {
         "session_id":      session.id,
@@ -10,6 +10,7 @@ Routes:
 3. AI_POWERED: High severity, unclear data, or unknown symptom → Gemini conversation
 """
 
+import time
 from typing import Dict, List, Optional
 from models import model_c_rules
 
@@ -27,6 +28,9 @@ QUALITY_LEVELS = {
     "low": 1       # Don't trust → use AI
 }
 
+# Model B clarity values that always route to AI
+UNCLEAR_CLARITY = frozenset({"unclear", "ambiguous"})
+
 # ============================================================================
 # ROUTING MODES
 # ============================================================================
@@ -130,7 +134,7 @@ def route_conversation(
         use_ai_reasons.append("low transcription quality")
     
     # 3. Unclear/ambiguous transcription
-    if clarity in ["unclear", "ambiguous"]:
+    if clarity in UNCLEAR_CLARITY:
         use_ai_reasons.append(f"transcription clarity: {clarity}")
     
     # 4. Medium quality + medium severity (borderline, play safe)
@@ -195,7 +199,7 @@ def should_use_ai(
         return True
     
     # Poor quality → AI
-    if transcription_quality == "low" or clarity in ["unclear", "ambiguous"]:
+    if transcription_quality == "low" or clarity in UNCLEAR_CLARITY:
         return True
     
     # Otherwise, rule-based is fine
@@ -310,11 +314,9 @@ def log_routing_decision(routing_result: Dict, session_id: str = None):
         routing_result: Output from route_conversation()
         session_id: Optional session identifier
     """
-    from datetime import datetime
-    
     entry = {
         "session_id": session_id,
-        "timestamp": datetime.now().isoformat(),
+        "ts": time.time(),  # epoch seconds; format when reporting
         "mode": routing_result["mode"],
         "reasoning": routing_result["reasoning"],
         **get_conversation_strategy(routing_result)
@@ -1,12 +1,27 @@
 """
-session.py — In-memory session store and shared data types.
+session.py — Session store and shared data types.
 
 Each patient visit is a Session. It is created when the patient arrives
 and mutated as the pipeline progresses. Session IDs are the keys.
+
+Storage backends:
+    in-memory (default) — sessions live in this process only. The store is an
+        LRU capped at SESSION_STORE_MAX_SIZE entries; idle sessions also expire
+        after SESSION_TTL_SECONDS.
+    Redis (REDIS_URL set) — sessions are shared across uvicorn/gunicorn workers
+        and expire after SESSION_TTL_SECONDS. Handlers must call save_session()
+        after mutating a session so the change reaches Redis. Async handlers use
+        aget_session()/asave_session(), which go through redis.asyncio instead of
+        blocking the event loop on the network round trip.
 """
 
+import os
+import json
+import time
 import uuid
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from threading import Lock
+from dataclasses import dataclass, field, fields, asdict
 from typing import Optional
 from enum import Enum
 
@@ -80,9 +95,77 @@ class Session:
 
 
 # ---------------------------------------------------------------------------
-# Simple in-memory store — swap for Redis or a DB in production
+# Session store — in-memory by default, Redis when REDIS_URL is configured
 # ---------------------------------------------------------------------------
-_store: dict[str, Session] = {}
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", 3600))
+SESSION_STORE_MAX_SIZE = int(os.getenv("SESSION_STORE_MAX_SIZE", 10_000))
+_REDIS_URL          = os.getenv("REDIS_URL", "").strip()
+_REDIS_KEY_PREFIX   = "session:"
+_SESSION_FIELDS     = frozenset(f.name for f in fields(Session))
+
+# session_id -> (session, expires_at); least recently used first
+_store: "OrderedDict[str, tuple[Session, float]]" = OrderedDict()
+_store_lock = Lock()
+_redis_client = None
+_aredis_client = None
+
+
+def _redis():
+    global _redis_client
+    if _redis_client is None:
+        import redis
+        _redis_client = redis.Redis.from_url(_REDIS_URL, decode_responses=True)
+    return _redis_client
+
+
+def _aredis():
+    global _aredis_client
+    if _aredis_client is None:
+        import redis.asyncio
+        _aredis_client = redis.asyncio.Redis.from_url(_REDIS_URL, decode_responses=True)
+    return _aredis_client
+
+
+def _serialize(session: Session) -> str:
+    # vars() also picks up attributes routers attach at runtime (db_session_id, audio_files, ...)
+    data = dict(vars(session))
+    data["stage"] = session.stage.value
+    data["turns"] = [asdict(t) for t in session.turns]
+    return json.dumps(data, ensure_ascii=False, default=str)
+
+
+def _deserialize(raw: str) -> Session:
+    data   = json.loads(raw)
+    extras = {k: data.pop(k) for k in list(data) if k not in _SESSION_FIELDS}
+    data["stage"] = SessionStage(data["stage"])
+    data["turns"] = [ConversationTurn(**t) for t in data.get("turns", [])]
+    session = Session(**data)
+    for key, value in extras.items():
+        setattr(session, key, value)
+    return session
+
+
+def _purge_expired(now: float) -> None:
+    # Caller holds _store_lock. Entries are in touch order, so stop at the first live one.
+    while _store:
+        session_id, (_, expires_at) = next(iter(_store.items()))
+        if expires_at > now:
+            break
+        del _store[session_id]
+
+
+def save_session(session: Session) -> None:
+    """Persist a mutated session. In memory the stored object is already the live one."""
+    if _REDIS_URL:
+        _redis().set(_REDIS_KEY_PREFIX + session.id, _serialize(session), ex=SESSION_TTL_SECONDS)
+    else:
+        now = time.monotonic()
+        with _store_lock:
+            _store[session.id] = (session, now + SESSION_TTL_SECONDS)
+            _store.move_to_end(session.id)
+            _purge_expired(now)
+            while len(_store) > SESSION_STORE_MAX_SIZE:
+                _store.popitem(last=False)
 
 
 def create_session(language: str = "unknown", patient_age: Optional[int] = None,
@@ -93,17 +176,74 @@ def create_session(language: str = "unknown", patient_age: Optional[int] = None,
         patient_age = patient_age,
         location    = location,
     )
-    _store[session.id] = session
+    save_session(session)
     return session
 
 
 def get_session(session_id: str) -> Optional[Session]:
-    return _store.get(session_id)
+    if _REDIS_URL:
+        # GETEX refreshes the TTL on read, matching the in-memory store's sliding expiry
+        raw = _redis().getex(_REDIS_KEY_PREFIX + session_id, ex=SESSION_TTL_SECONDS)
+        return _deserialize(raw) if raw else None
+    now = time.monotonic()
+    with _store_lock:
+        entry = _store.get(session_id)
+        if entry is None:
+            return None
+        session, expires_at = entry
+        if expires_at <= now:
+            del _store[session_id]
+            return None
+        _store[session_id] = (session, now + SESSION_TTL_SECONDS)
+        _store.move_to_end(session_id)
+        return session
+
+
+async def aget_session(session_id: str) -> Optional[Session]:
+    """get_session() for async handlers; awaits Redis rather than blocking the event loop."""
+    if _REDIS_URL:
+        raw = await _aredis().getex(_REDIS_KEY_PREFIX + session_id, ex=SESSION_TTL_SECONDS)
+        return _deserialize(raw) if raw else None
+    return get_session(session_id)
+
+
+async def asave_session(session: Session) -> None:
+    """save_session() for async handlers; awaits Redis rather than blocking the event loop."""
+    if _REDIS_URL:
+        await _aredis().set(_REDIS_KEY_PREFIX + session.id, _serialize(session), ex=SESSION_TTL_SECONDS)
+    else:
+        save_session(session)
 
 
 def delete_session(session_id: str) -> None:
-    _store.pop(session_id, None)
+    if _REDIS_URL:
+        _redis().delete(_REDIS_KEY_PREFIX + session_id)
+    else:
+        with _store_lock:
+            _store.pop(session_id, None)
 
 
 def all_session_ids() -> list[str]:
-    return list(_store.keys())
\ No newline at end of file
+    if _REDIS_URL:
+        prefix_len = len(_REDIS_KEY_PREFIX)
+        return [key[prefix_len:] for key in _redis().scan_iter(match=_REDIS_KEY_PREFIX + "*")]
+    with _store_lock:
+        _purge_expired(time.monotonic())
+        return list(_store.keys())
+
+
+def all_sessions() -> list[Session]:
+    """
+    Every live session, for listings such as the doctor dashboard. Unlike
+    get_session() this is a read-only peek: it does not refresh TTL or LRU order,
+    so polling the listing cannot keep abandoned sessions alive.
+    """
+    if _REDIS_URL:
+        client = _redis()
+        keys = list(client.scan_iter(match=_REDIS_KEY_PREFIX + "*"))
+        if not keys:
+            return []
+        return [_deserialize(raw) for raw in client.mget(keys) if raw]
+    with _store_lock:
+        _purge_expired(time.monotonic())
+        return [session for session, _ in _store.values()]
@@ -0,0 +1,123 @@
+"""
+Unit tests for the in-memory session store in session.py.
+
+These tests cover the pure-Python backend only; REDIS_URL is forced off.
+
+Run from the backend/ directory:
+    python -m pytest test_unit_session.py -v
+"""
+import sys
+import os
+import asyncio
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+import session as session_store
+from session import Session, SessionStage, ConversationTurn, _serialize, _deserialize
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Empty in-memory store with a controllable monotonic clock."""
+    now = [1000.0]
+    monkeypatch.setattr(session_store, "_REDIS_URL", "")
+    monkeypatch.setattr(session_store, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    monkeypatch.setattr(session_store, "SESSION_TTL_SECONDS", 60)
+    session_store._store.clear()
+    yield now
+    session_store._store.clear()
+
+
+class TestLRUEviction:
+    """Tests for the SESSION_STORE_MAX_SIZE cap."""
+
+    def test_oldest_session_is_evicted(self, clock, monkeypatch):
+        monkeypatch.setattr(session_store, "SESSION_STORE_MAX_SIZE", 2)
+        first = session_store.create_session()
+        second = session_store.create_session()
+        third = session_store.create_session()
+        assert session_store.get_session(first.id) is None
+        assert session_store.get_session(second.id) is second
+        assert session_store.get_session(third.id) is third
+
+    def test_read_marks_session_recently_used(self, clock, monkeypatch):
+        """A session that was just read must survive eviction ahead of an idle one."""
+        monkeypatch.setattr(session_store, "SESSION_STORE_MAX_SIZE", 2)
+        first = session_store.create_session()
+        second = session_store.create_session()
+        session_store.get_session(first.id)
+        session_store.create_session()
+        assert session_store.get_session(first.id) is first
+        assert session_store.get_session(second.id) is None
+
+
+class TestTTLExpiry:
+    """Tests for SESSION_TTL_SECONDS sliding expiry."""
+
+    def test_session_expires_after_ttl(self, clock):
+        s = session_store.create_session()
+        clock[0] += 61
+        assert session_store.get_session(s.id) is None
+        assert s.id not in session_store.all_session_ids()
+
+    def test_read_extends_ttl(self, clock):
+        s = session_store.create_session()
+        clock[0] += 50
+        assert session_store.get_session(s.id) is s
+        clock[0] += 50  # 100s after creation, but only 50s after the last read
+        assert session_store.get_session(s.id) is s
+
+    def test_listing_does_not_extend_ttl(self, clock):
+        """A dashboard polling the session list must not keep idle sessions alive."""
+        s = session_store.create_session()
+        clock[0] += 50
+        assert [x.id for x in session_store.all_sessions()] == [s.id]
+        clock[0] += 20  # 70s after creation; the listing above must not have reset the clock
+        assert session_store.all_sessions() == []
+        assert session_store.get_session(s.id) is None
+
+    def test_expired_sessions_are_purged_on_save(self, clock):
+        stale = session_store.create_session()
+        clock[0] += 61
+        session_store.create_session()
+        assert stale.id not in session_store._store
+
+
+class TestAsyncAccessors:
+    """aget_session()/asave_session() must behave like the sync pair on the in-memory store."""
+
+    def test_async_roundtrip_shares_store_and_ttl(self, clock):
+        s = Session(id="abc")
+        asyncio.run(session_store.asave_session(s))
+        assert session_store.get_session("abc") is s
+        clock[0] += 50
+        assert asyncio.run(session_store.aget_session("abc")) is s
+        clock[0] += 50  # only 50s after the last (async) read
+        assert session_store.get_session("abc") is s
+        assert asyncio.run(session_store.aget_session("missing")) is None
+
+
+class TestSerialization:
+    """Tests for the _serialize()/_deserialize() round-trip used by the Redis backend."""
+
+    def test_roundtrip_preserves_fields(self):
+        s = Session(id="abc", stage=SessionStage.QUESTIONING, language="english",
+                    patient_age=34, extraction={"symptoms": ["fever"]})
+        s.turns.append(ConversationTurn(question="How long?", answer="3 days"))
+        restored = _deserialize(_serialize(s))
+        assert restored.stage is SessionStage.QUESTIONING
+        assert restored.patient_age == 34
+        assert restored.extraction == {"symptoms": ["fever"]}
+        assert restored.turns == [ConversationTurn(question="How long?", answer="3 days")]
+
+    def test_roundtrip_preserves_runtime_attributes(self):
+        """Routers attach db_session_id/audio_files at runtime; losing them would
+        break kiosk_finish after a Redis round-trip."""
+        s = Session(id="abc")
+        s.db_session_id = 42
+        s.audio_files = [{"path": "/tmp/a.wav", "sequence_number": 1}]
+        restored = _deserialize(_serialize(s))
+        assert restored.db_session_id == 42
+        assert restored.audio_files == [{"path": "/tmp/a.wav", "sequence_number": 1}]
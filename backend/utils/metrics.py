@@ -0,0 +1,24 @@
+"""
+utils/metrics.py — Prometheus metrics for the kiosk pipeline.
+
+HTTP request metrics and the /metrics endpoint are added in main.py by
+prometheus-fastapi-instrumentator. This module holds the per-stage model
+timers so the dashboard can show where a session's time is spent.
+"""
+
+import asyncio
+from prometheus_client import Histogram
+
+# Model calls take from ~1s (Gemini) to over a minute (Whisper on CPU)
+MODEL_STAGE_SECONDS = Histogram(
+    "kiosk_model_stage_seconds",
+    "Time spent in each model stage of the kiosk pipeline",
+    ["stage"],
+    buckets=(0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300),
+)
+
+
+async def timed_to_thread(stage: str, func, /, *args, **kwargs):
+    """asyncio.to_thread() that records the call duration under the given stage label."""
+    with MODEL_STAGE_SECONDS.labels(stage).time():
+        return await asyncio.to_thread(func, *args, **kwargs)
@@ -9,6 +9,7 @@ Purpose:
 """
 
 import json
+import time
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from collections import Counter, defaultdict
@@ -69,7 +70,7 @@ def log_unknown_symptom(complaint: str, session_id: str = None):
     _UNKNOWN_SYMPTOMS_LOG.append({
         "complaint": complaint.lower().strip(),
         "session_id": session_id,
-        "timestamp": datetime.now().isoformat()
+        "ts": time.time()  # epoch seconds; formatted only on export
     })
     
     print(f"[EXPANSION] Unknown symptom: '{complaint}' (session: {session_id})")
@@ -348,7 +349,14 @@ def export_logs(filepath: str):
     """
     data = {
         "sessions": _SESSION_LOG,
-        "unknown_symptoms": _UNKNOWN_SYMPTOMS_LOG,
+        "unknown_symptoms": [
+            {
+                "complaint": entry["complaint"],
+                "session_id": entry["session_id"],
+                "timestamp": datetime.fromtimestamp(entry["ts"]).isoformat(),
+            }
+            for entry in _UNKNOWN_SYMPTOMS_LOG
+        ],
         "exported_at": datetime.now().isoformat()
     }
     
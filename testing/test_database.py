@@ -1,5 +1,6 @@
 import sys
 import os
+from contextlib import contextmanager
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
 
@@ -47,48 +48,120 @@ def test_tables_exist():
         return False
 
 
+@contextmanager
+def rolled_back_transaction():
+    """
+    Route every DatabaseConnection.get_connection() call to one shared connection
+    and roll it back at the end, so the *DB helpers run for real but commit nothing.
+    """
+    original_get_connection = DatabaseConnection.__dict__['get_connection']
+    original_prepare = DatabaseConnection.__dict__['_prepare']
+    
+    with original_get_connection.__func__(DatabaseConnection) as conn:
+        @contextmanager
+        def shared_connection(readonly=False):
+            yield conn
+        
+        DatabaseConnection.get_connection = staticmethod(shared_connection)
+        # _execute recovers from a failed PREPARE with conn.rollback(), which here
+        # would silently discard the earlier steps, so run everything unprepared
+        DatabaseConnection._prepare = classmethod(lambda cls, conn, query: None)
+        try:
+            yield conn
+        finally:
+            DatabaseConnection.get_connection = original_get_connection
+            DatabaseConnection._prepare = original_prepare
+            conn.rollback()
+
+
 def test_crud_operations():
     print("\n🔧 Testing CRUD operations...")
+    patient = None
     
     try:
-        patient = PatientDB.create_patient("Test Patient", "+250788999999", "kinyarwanda", "Kigali")
-        print(f"  ✅ Patient created: {patient['patient_id']}")
+        # Helpers share one transaction that is rolled back: no DELETE cleanup,
+        # and no orphan rows if a step fails
+        with rolled_back_transaction():
+            patient = PatientDB.create_patient("Test Patient", "+250788999999", "kinyarwanda", "Kigali")
+            print(f"  ✅ Patient created: {patient['patient_id']}")
+            
+            session = SessionDB.create_session(patient['patient_id'])
+            print(f"  ✅ Session created: {session['session_id']}")
+            
+            message = ConversationDB.add_message(
+                session['session_id'], 'ml_system', 'Hello, how can I help you?', 1
+            )
+            print(f"  ✅ Message added: {message['message_id']}")
+            
+            symptom = SymptomDB.add_symptom(session['session_id'], 'fever', 'moderate', '3 days')
+            print(f"  ✅ Symptom added: {symptom['symptom_id']}")
+            
+            prediction = PredictionDB.create_prediction(
+                session['session_id'], 'Suspected Typhoid', 'medium', 0.8523, 'v1.0.0'
+            )
+            print(f"  ✅ Prediction created: {prediction['prediction_id']}")
+            
+            SessionDB.update_session_status(session['session_id'], 'awaiting_review')
+            print("  ✅ Session status updated")
+            
+            bundle = SessionDB.get_session_bundle(session['session_id'])
+            
+            assert bundle['patient']['patient_id'] == patient['patient_id']
+            assert bundle['session']['status'] == 'awaiting_review'
+            assert len(bundle['messages']) == 1 and len(bundle['symptoms']) == 1
+            assert bundle['prediction']['prediction_id'] == prediction['prediction_id']
+            print("  ✅ All read operations successful")
+        print("  ✅ Test data rolled back")
         
+        return True
+    except Exception as e:
+        print(f"  ❌ CRUD failed: {e}")
+        return False
+    finally:
+        # Lookups inside the transaction may have cached rows that no longer exist
+        if patient:
+            PatientDB.invalidate(patient_id=patient['patient_id'], phone_number="+250788999999")
+
+
+def test_batch_inserts():
+    print("\n📦 Testing batch inserts...")
+    
+    try:
+        patient = PatientDB.create_patient("Batch Test", "+250788777777", "english")
         session = SessionDB.create_session(patient['patient_id'])
-        print(f"  ✅ Session created: {session['session_id']}")
-        
-        message = ConversationDB.add_message(
-            session['session_id'], 'ml_system', 'Hello, how can I help you?', 1
-        )
-        print(f"  ✅ Message added: {message['message_id']}")
-        
-        symptom = SymptomDB.add_symptom(session['session_id'], 'fever', 'moderate', '3 days')
-        print(f"  ✅ Symptom added: {symptom['symptom_id']}")
-        
-        prediction = PredictionDB.create_prediction(
-            session['session_id'], 'Suspected Typhoid', 'medium', 0.8523, 'v1.0.0'
-        )
-        print(f"  ✅ Prediction created: {prediction['prediction_id']}")
-        
-        SessionDB.update_session_status(session['session_id'], 'awaiting_review')
-        print("  ✅ Session status updated")
-        
-        retrieved_patient = PatientDB.get_patient_by_id(patient['patient_id'])
-        retrieved_session = SessionDB.get_session(session['session_id'])
-        conversation = ConversationDB.get_conversation(session['session_id'])
-        symptoms = SymptomDB.get_session_symptoms(session['session_id'])
+        sid = session['session_id']
         
-        assert retrieved_patient and retrieved_session['status'] == 'awaiting_review'
-        assert len(conversation) == 1 and len(symptoms) == 1
-        print("  ✅ All read operations successful")
-        
-        DatabaseConnection.execute_update("DELETE FROM session WHERE session_id = %s", (session['session_id'],))
-        DatabaseConnection.execute_update("DELETE FROM patient WHERE patient_id = %s", (patient['patient_id'],))
-        print("  ✅ Test data cleaned")
+        try:
+            # Twice, so the second round goes through an already-warm connection/statement cache
+            for offset in (0, 2):
+                messages = ConversationDB.add_messages([
+                    (sid, 'ml_system', 'What brings you in today?', offset + 1, None),
+                    (sid, 'patient', 'Fever and headache', offset + 2, {'source': 'kiosk'}),
+                ])
+                assert len(messages) == 2
+            print("  ✅ add_messages works")
+            
+            for _ in range(2):
+                symptoms = SymptomDB.add_symptoms([
+                    (sid, 'fever', 'moderate', '3 days', None),
+                    (sid, 'headache', None, None, 'since morning'),
+                ])
+                assert len(symptoms) == 2
+            print("  ✅ add_symptoms works")
+            
+            conversation = ConversationDB.get_conversation(sid)
+            assert [m.sequence_number for m in conversation] == [1, 2, 3, 4]
+            assert conversation[1].metadata == {'source': 'kiosk'}
+            symptoms = SymptomDB.get_session_symptoms(sid)
+            assert len(symptoms) == 4 and symptoms[0].severity == 'moderate'
+            print("  ✅ Batch rows read back")
+        finally:
+            DatabaseConnection.execute_update("DELETE FROM session WHERE session_id = %s", (sid,))
+            DatabaseConnection.execute_update("DELETE FROM patient WHERE patient_id = %s", (patient['patient_id'],))
         
         return True
     except Exception as e:
-        print(f"  ❌ CRUD failed: {e}")
+        print(f"  ❌ Batch inserts failed: {e}")
         return False
 
 
@@ -111,6 +184,23 @@ def test_functions():
         DatabaseConnection.execute_update("DELETE FROM session WHERE session_id = %s", (session['session_id'],))
         DatabaseConnection.execute_update("DELETE FROM patient WHERE patient_id = %s", (patient['patient_id'],))
         
+        started = SessionDB.start_consultation('english', 'Kigali')
+        try:
+            assert started['patient_id'] and started['session_id']
+            print(f"  ✅ start_consultation works (patient {started['patient_id']}, session {started['session_id']})")
+            
+            prediction = PredictionDB.finalize_prediction(
+                started['session_id'], 'Suspected Typhoid', 'high', 0.9123, 'v1.0.0'
+            )
+            assert prediction['prediction_id'] and prediction['session_id'] == started['session_id']
+            finalized = SessionDB.get_session(started['session_id'])
+            assert finalized['prediction_label'] == 'Suspected Typhoid'
+            assert float(finalized['prediction_confidence']) == 0.9123
+            print("  ✅ finalize_prediction works")
+        finally:
+            DatabaseConnection.execute_update("DELETE FROM session WHERE session_id = %s", (started['session_id'],))
+            DatabaseConnection.execute_update("DELETE FROM patient WHERE patient_id = %s", (started['patient_id'],))
+        
         return True
     except Exception as e:
         print(f"  ❌ Functions failed: {e}")
@@ -133,6 +223,7 @@ def run_all_tests():
     results.extend([
         ("Tables", test_tables_exist()),
         ("CRUD Operations", test_crud_operations()),
+        ("Batch Inserts", test_batch_inserts()),
         ("Functions", test_functions()),
     ])
     
@@ -3,18 +3,23 @@ Simple CLI Client for Testing Conversational API
 Run this to chat with the API
 """
 
+import sys
 import requests
-import json
+import orjson
+from requests.adapters import HTTPAdapter
 
 # API Configuration
 API_BASE_URL = "http://localhost:8000"
 
-def print_separator():
-    print("\n" + "="*70 + "\n")
+# Reuse one keep-alive connection for every turn instead of a new TCP handshake per request
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+SESSION.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
 
-def start_demo():
-    """Start the conversational demo"""
-    print("""
+# Built once at import; the trailing "\n\n" matches what print() used to emit
+_SEP = "\n" + "=" * 70 + "\n\n"
+
+_BANNER = """
 ╔══════════════════════════════════════════════════════════════════╗
 ║                                                                  ║
 ║         🏥 TYPHOID DIAGNOSTIC CONVERSATIONAL API DEMO           ║
@@ -23,15 +28,23 @@ def start_demo():
 ║         The AI will guide you through the consultation           ║
 ║                                                                  ║
 ╚══════════════════════════════════════════════════════════════════╝
-    """)
+
+"""
+
+def print_separator():
+    sys.stdout.write(_SEP)
+
+def start_demo():
+    """Start the conversational demo"""
+    sys.stdout.write(_BANNER)
     
     # Start conversation
     print("🔄 Starting new consultation...\n")
     
     try:
-        response = requests.post(f"{API_BASE_URL}/conversation/start")
+        response = SESSION.post(f"{API_BASE_URL}/conversation/start")
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
     except requests.exceptions.ConnectionError:
         print("❌ Error: Cannot connect to API server")
         print("Make sure the API is running: python conversational_api.py")
@@ -72,15 +85,16 @@ def start_demo():
         
         # Send message to API
         try:
-            response = requests.post(
+            response = SESSION.post(
                 f"{API_BASE_URL}/conversation/message",
-                json={
+                data=orjson.dumps({
                     "session_id": session_id,
                     "message": user_input
-                }
+                }),
+                headers={"Content-Type": "application/json"}
             )
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
         except Exception as e:
             print(f"❌ Error: {e}")
             break
@@ -112,9 +126,12 @@ def start_demo():
                 print("📜 CONVERSATION HISTORY:")
                 print_separator()
                 
-                for msg in data['conversation_history']:
-                    role_emoji = "🤖" if msg['role'] == 'agent' else "👤"
-                    print(f"{role_emoji} {msg['role'].upper()}: {msg['content']}\n")
+                # Render the whole history in one write rather than a print() per message
+                sys.stdout.write("".join(
+                    f"{'🤖' if msg['role'] == 'agent' else '👤'} {msg['role'].upper()}: {msg['content']}\n\n"
+                    for msg in data['conversation_history']
+                ))
+                sys.stdout.flush()
             
             break
         
@@ -135,10 +152,10 @@ def start_demo():
 def test_api_health():
     """Test if API is running"""
     try:
-        response = requests.get(f"{API_BASE_URL}/")
+        response = SESSION.get(f"{API_BASE_URL}/")
         if response.status_code == 200:
             print("✅ API is running and healthy")
-            print(f"   {response.json()}")
+            print(f"   {orjson.loads(response.content)}")
             return True
         else:
             print(f"⚠️  API responded with status code: {response.status_code}")